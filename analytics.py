@@ -1,7 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 
@@ -32,6 +30,9 @@ def analytics_dashboard():
         st.info("💡 **Pro Tip**: Share your Gift Guru app with friends and collect feedback to see analytics here.")
         return
     
+    # plotly is only loaded once there is something to chart
+    import plotly.express as px
+    
     # Key Metrics Row
     col1, col2, col3, col4 = st.columns(4)
     
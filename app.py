@@ -1,12 +1,14 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import plotly.express as px
 import random
 from datetime import datetime
 import os
+import sys
+
+# Shared storage/indexing modules live alongside the FastAPI backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from feedback_store import FeedbackWriter, build_feedback_row
+from gift_index import PRICE_DECIMALS, top_k
+from index_bundle import load_index
 
 # Set page config
 st.set_page_config(
@@ -67,6 +69,7 @@ st.markdown("""
 class GiftRecommender:
     def __init__(self):
         self.load_gift_database()
+        self.feedback_writer = None
         self.malayali_phrases = [
             "This is mallu-level epic! 🔥",
             "Adipoli choice, machane! 👌",
@@ -81,28 +84,16 @@ class GiftRecommender:
     def load_gift_database(self):
         """Load and prepare the gift database"""
         try:
-            self.gifts_df = pd.read_csv('gift_database.csv')
-            
-            # Create combined features for similarity matching
-            self.gifts_df['combined_features'] = (
-                self.gifts_df['category'].fillna('') + ' ' +
-                self.gifts_df['tags'].fillna('') + ' ' +
-                self.gifts_df['description'].fillna('')
-            )
-            
-            # Initialize TF-IDF vectorizer
-            self.vectorizer = TfidfVectorizer(
-                stop_words='english',
-                ngram_range=(1, 2),
-                max_features=1000
-            )
-            
-            # Fit vectorizer on gift features
-            self.gift_vectors = self.vectorizer.fit_transform(self.gifts_df['combined_features'])
+            # Same fitted index as the FastAPI recommender: price-ordered so
+            # budget filters become contiguous slices, with the catalog held
+            # in compact columns instead of a DataFrame
+            bundle = load_index('gift_database.csv', 'recommender')
+            self.vectorizer = bundle.vectorizer
+            self.gift_index = bundle.index
             
         except FileNotFoundError:
             st.error("Gift database not found! Please ensure gift_database.csv exists.")
-            self.gifts_df = pd.DataFrame()
+            self.gift_index = None
     
     def create_user_profile(self, age_range, gender, interests, occasion, budget):
         """Create user profile for matching"""
@@ -111,47 +102,35 @@ class GiftRecommender:
     
     def get_recommendations(self, user_profile, budget_min, budget_max, num_recommendations=5):
         """Get gift recommendations based on user profile"""
-        if self.gifts_df.empty:
+        if self.gift_index is None or len(self.gift_index) == 0:
             return []
         
-        # Filter by budget
-        budget_filtered = self.gifts_df[
-            (self.gifts_df['price'] >= budget_min) & 
-            (self.gifts_df['price'] <= budget_max)
-        ]
-        
-        if budget_filtered.empty:
-            # If no gifts in budget, expand the range
-            budget_filtered = self.gifts_df[
-                self.gifts_df['price'] <= budget_max + 20
-            ]
+        # Budget filtering is two binary searches over the price-ordered index
+        start, end = self.gift_index.budget_range(budget_min, budget_max)
         
-        if budget_filtered.empty:
+        if start == end:
             return []
         
         # Vectorize user profile
         user_vector = self.vectorizer.transform([user_profile])
         
         # Get similarity scores for budget-filtered items
-        budget_indices = budget_filtered.index
-        filtered_vectors = self.gift_vectors[budget_indices]
-        
-        similarity_scores = cosine_similarity(user_vector, filtered_vectors).flatten()
+        similarity_scores = self.gift_index.score_between(user_vector, start, end)
         
         # Get top recommendations
-        top_indices = similarity_scores.argsort()[-num_recommendations:][::-1]
+        top_indices = top_k(similarity_scores, num_recommendations)
         
+        index = self.gift_index
         recommendations = []
-        for idx in top_indices:
-            gift_idx = budget_indices[idx]
-            gift = self.gifts_df.iloc[gift_idx]
+        for idx in top_indices.tolist():
+            position = start + idx
             
             recommendations.append({
-                'name': gift['product_name'],
-                'price': gift['price'],
-                'description': gift['description'],
-                'link': gift['link'],
-                'category': gift['category'],
+                'name': index.columns['product_name'][position],
+                'price': round(float(index.prices[position]), PRICE_DECIMALS),
+                'description': index.columns['description'][position],
+                'link': index.columns['link'][position],
+                'category': index.columns['category'][position],
                 'similarity_score': similarity_scores[idx],
                 'malayali_phrase': random.choice(self.malayali_phrases)
             })
@@ -159,35 +138,24 @@ class GiftRecommender:
         return recommendations
 
     def save_feedback(self, user_data, recommendations, ratings):
-        """Save user feedback to CSV"""
-        feedback_data = {
-            'timestamp': datetime.now().isoformat(),
-            'age_range': user_data.get('age_range', ''),
-            'gender': user_data.get('gender', ''),
-            'interests': user_data.get('interests', ''),
-            'occasion': user_data.get('occasion', ''),
-            'budget': f"${user_data.get('budget_min', 0)}-${user_data.get('budget_max', 0)}",
-            'recommendations': str([r['name'] for r in recommendations]),
-            'ratings': str(ratings),
-            'average_rating': np.mean([r for r in ratings if r > 0])
-        }
-        
-        feedback_df = pd.DataFrame([feedback_data])
+        """Append user feedback to CSV"""
+        feedback_data = build_feedback_row(
+            datetime.now().isoformat(), user_data, recommendations, ratings
+        )
         
-        # Append to existing feedback file or create new one
-        feedback_file = 'user_feedback.csv'
-        if os.path.exists(feedback_file):
-            existing_feedback = pd.read_csv(feedback_file)
-            feedback_df = pd.concat([existing_feedback, feedback_df], ignore_index=True)
+        if self.feedback_writer is None:
+            self.feedback_writer = FeedbackWriter('user_feedback.csv')
         
-        feedback_df.to_csv(feedback_file, index=False)
+        self.feedback_writer.append(feedback_data)
 
-# Initialize the recommender
-@st.cache_resource
-def load_recommender():
+# Initialize the recommender (rebuilt whenever gift_database.csv is edited)
+@st.cache_resource(max_entries=1)
+def load_recommender(catalog_mtime):
     return GiftRecommender()
 
-recommender = load_recommender()
+recommender = load_recommender(
+    os.path.getmtime('gift_database.csv') if os.path.exists('gift_database.csv') else None
+)
 
 # Main App
 def main():
@@ -0,0 +1,12 @@
+"""Gift Guru backend
+
+The modules here import each other as top-level modules, the way uvicorn and
+gunicorn load them from this directory. Putting the directory on the path
+lets them also be imported as a package from the repository root, e.g.
+``from backend.amazon_api import amazon_api``.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
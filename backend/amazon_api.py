@@ -1,12 +1,24 @@
 """Amazon Product Advertising API Integration for Gift Recommender System"""
 
+import asyncio
+import math
 import os
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import time
 import logging
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field
+import sys
+from typing import List, Dict, NamedTuple, Optional, Any
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 
+from persistent_cache import SQLiteCache
+from single_flight import AsyncSingleFlight, SingleFlight
+from ttl_cache import TTLCache
+
 try:
     from amazon_paapi import AmazonApi
 except ImportError:
@@ -49,6 +61,83 @@ class AmazonProduct:
             'keywords': self.keywords
         }
 
+class CachedProducts(NamedTuple):
+    """Cache entry: products and the wall-clock time they go stale"""
+    products: tuple
+    fresh_until: float
+    
+    @property
+    def stale(self) -> bool:
+        return time.time() >= self.fresh_until
+
+class SearchResult(NamedTuple):
+    products: List[AmazonProduct]
+    stale: bool  # served from cache past cache_ttl, refresh pending
+
+class TokenBucket:
+    """Token bucket rate limiter shared by blocking and asyncio callers
+    
+    Each caller reserves a token up front and is told how long to wait for
+    it, so waiters are served in arrival order and a sync call and an async
+    call never spend the same token. ``acquire_async`` waits with
+    ``asyncio.sleep`` and keeps the event loop free.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1, clock=time.monotonic):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._tickets = 0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token, returning the seconds to wait before using it"""
+        return self._reserve()[0]
+    
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+    
+    async def acquire_async(self):
+        delay, ticket = self._reserve()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._cancel(ticket)
+                raise
+    
+    def _reserve(self):
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance is the queue of callers already waiting
+            self._tokens -= 1
+            self._tickets += 1
+            return max(0.0, -self._tokens / self.rate), self._tickets
+    
+    def _cancel(self, ticket):
+        """Give back a token whose wait was cancelled
+        
+        Only the most recent reservation can be returned; refunding one from
+        the middle of the queue would hand its slot to two later callers.
+        """
+        with self._lock:
+            if ticket == self._tickets:
+                self._tokens += 1
+                self._tickets -= 1
+    
+    @property
+    def queued(self) -> int:
+        """Callers currently waiting for a token"""
+        with self._lock:
+            balance = self._tokens + (self.clock() - self._updated) * self.rate
+            return max(0, math.ceil(-balance))
+
 class AmazonAPIManager:
     """Manages Amazon Product Advertising API interactions"""
     
@@ -56,16 +145,57 @@ class AmazonAPIManager:
         self.api: Optional[AmazonApi] = None
         self.last_request_time = 0
         self.throttle_delay = 1.5  # seconds between requests
-        self.cache: Dict[str, Dict] = {}
+        self.rate_limiter = TokenBucket(rate=1 / self.throttle_delay)
+        # Blocking SDK calls from the async methods run here, apart from the
+        # default executor other code may be using
+        self.max_concurrency = 4
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='amazon-api')
         self.cache_ttl = 3600  # 1 hour cache
+        # Past cache_ttl, entries are still served for this long while one
+        # background refresh per key brings them up to date
+        self.stale_grace = float(os.getenv('AMAZON_CACHE_STALE_GRACE', '900'))
+        self._revalidating = {}  # cache key -> refresh thread or task
+        self._revalidating_lock = threading.Lock()
+        self.revalidations = 0
+        # Search results are kept as ready-to-serve AmazonProduct tuples
+        self.cache = TTLCache(
+            max_entries=int(os.getenv('AMAZON_CACHE_MAX_ENTRIES', '2048')),
+            max_bytes=int(os.getenv('AMAZON_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+            ttl=self.cache_ttl,
+            sizeof=_products_size
+        )
+        self.cache.start_sweeper(interval=60)
+        # Identical concurrent cache misses share one upstream call
+        self.flights = SingleFlight()
+        self.async_flights = AsyncSingleFlight()
+        # One live AmazonProduct per ASIN, so refreshing an item updates
+        # every cached search result that contains it
+        self._products = weakref.WeakValueDictionary()
+        self._products_lock = threading.Lock()
+        # How often each ASIN was served since it was last refreshed
+        self.served = Counter()
+        self._served_lock = threading.Lock()
+        self.refresh_share = float(os.getenv('AMAZON_REFRESH_SHARE', '0.25'))
+        self.refreshed_items = 0
         self.logger = logging.getLogger(__name__)
+        # Optional on-disk second level shared by all workers and restarts
+        self.persistent_cache: Optional[SQLiteCache] = None
+        self._initialize_persistent_cache()
         
         # Initialize API if credentials are available
-        self._initialize_api()
+        if self._initialize_api() and self.refresh_share > 0:
+            self.start_refresher(self.refresh_share)
     
     def _initialize_api(self) -> bool:
         """Initialize Amazon API with credentials"""
         try:
+            if os.getenv('AMAZON_API_MODE') == 'fake':
+                # Offline stand-in for load testing, see fake_paapi.py
+                from fake_paapi import FakeAmazonApi
+                self.api = FakeAmazonApi.from_env()
+                self.logger.info(f"Using fake Amazon API with {len(self.api.items)} products")
+                return True
+            
             # Try to get credentials from environment variables
             key = os.getenv('AMAZON_API_KEY')
             secret = os.getenv('AMAZON_API_SECRET')
@@ -95,24 +225,42 @@ class AmazonAPIManager:
             self.logger.error(f"Failed to initialize Amazon API: {e}")
             return False
     
-    def _wait_for_throttle(self):
-        """Implement throttling to respect API limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _initialize_persistent_cache(self) -> bool:
+        """Open the shared SQLite cache if AMAZON_CACHE_DB is set"""
+        path = os.getenv('AMAZON_CACHE_DB')
+        if not path:
+            return False
+        
+        try:
+            self.persistent_cache = SQLiteCache(path, ttl=self.cache_ttl + self.stale_grace)
+        except Exception as e:
+            self.logger.error(f"Failed to open persistent cache {path}: {e}")
+            return False
         
-        if time_since_last < self.throttle_delay:
-            wait_time = self.throttle_delay - time_since_last
-            time.sleep(wait_time)
+        vacuum_interval = float(os.getenv('AMAZON_CACHE_VACUUM_INTERVAL', '3600'))
+        if vacuum_interval > 0:
+            def vacuum_forever():
+                while True:
+                    time.sleep(vacuum_interval)
+                    try:
+                        self.persistent_cache.vacuum()
+                    except Exception as e:
+                        self.logger.error(f"Persistent cache vacuum failed: {e}")
+            
+            threading.Thread(target=vacuum_forever, name="cache-vacuum", daemon=True).start()
         
+        self.logger.info(f"Persistent Amazon cache at {path}")
+        return True
+    
+    def _wait_for_throttle(self):
+        """Implement throttling to respect API limits"""
+        self.rate_limiter.acquire()
         self.last_request_time = time.time()
     
-    def _is_cache_valid(self, key: str) -> bool:
-        """Check if cached data is still valid"""
-        if key not in self.cache:
-            return False
-        
-        cache_time = self.cache[key].get('timestamp', 0)
-        return time.time() - cache_time < self.cache_ttl
+    async def _wait_for_throttle_async(self):
+        """Wait for the rate budget without blocking the event loop"""
+        await self.rate_limiter.acquire_async()
+        self.last_request_time = time.time()
     
     def search_products(self, 
                       keywords: str, 
@@ -127,74 +275,385 @@ class AmazonAPIManager:
             return []
         
         # Create cache key
-        cache_key = f"{keywords}_{category}_{min_price}_{max_price}_{max_results}"
+        cache_key = self._search_key(keywords, category, min_price, max_price, max_results)
+        search_params = self._search_params(keywords, min_price, max_price, max_results)
         
-        # Check cache first
-        if self._is_cache_valid(cache_key):
+        # Check cache first (memory, then disk)
+        cached = self._cached(cache_key)
+        if cached is None:
+            cached = self._cached_on_disk(cache_key)
+        if cached is not None:
             self.logger.info(f"Returning cached results for: {keywords}")
-            return [AmazonProduct(**item) for item in self.cache[cache_key]['data']]
+            if cached.stale:
+                self._revalidate(cache_key, keywords, search_params)
+            return list(cached.products)
         
         try:
-            self._wait_for_throttle()
-            
-            # Search parameters
-            search_params = {
-                'keywords': keywords,
-                'item_count': max_results
-            }
-            
-            if min_price:
-                search_params['min_price'] = min_price * 100  # Convert to cents
-            if max_price:
-                search_params['max_price'] = max_price * 100  # Convert to cents
-            
-            # Execute search
-            search_result = self.api.search_items(**search_params)
-            
-            products = []
-            for item in search_result.items:
-                try:
-                    product = self._parse_amazon_item(item)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    self.logger.error(f"Error parsing item: {e}")
-                    continue
-            
-            # Cache results
-            self.cache[cache_key] = {
-                'data': [p.to_dict() for p in products],
-                'timestamp': time.time()
-            }
-            
-            self.logger.info(f"Found {len(products)} products for: {keywords}")
-            return products
+            return list(self.flights.do(
+                cache_key, partial(self._fetch_search_throttled, cache_key, keywords, search_params)
+            ))
             
         except Exception as e:
             self.logger.error(f"Amazon API search failed: {e}")
             return []
     
-    def get_product_details(self, asins: List[str]) -> List[AmazonProduct]:
-        """Get detailed product information by ASINs"""
+    async def search_products_async(self, 
+                                    keywords: str, 
+                                    category: str = None,
+                                    min_price: int = None,
+                                    max_price: int = None,
+                                    max_results: int = 10) -> List[AmazonProduct]:
+        """Search Amazon products by keywords without blocking the event loop
+        
+        Waiting for the rate budget yields to the loop, and the blocking SDK
+        call runs in a worker thread.
+        """
+        search = await self.search_async(keywords, category, min_price, max_price, max_results)
+        return search.products
+    
+    async def search_async(self, 
+                           keywords: str, 
+                           category: str = None,
+                           min_price: int = None,
+                           max_price: int = None,
+                           max_results: int = 10) -> SearchResult:
+        """Like ``search_products_async``, also telling whether the products are stale"""
         
         if not self.api:
-            return []
+            self.logger.warning("Amazon API not available, returning empty results")
+            return SearchResult([], False)
+        
+        cache_key = self._search_key(keywords, category, min_price, max_price, max_results)
+        search_params = self._search_params(keywords, min_price, max_price, max_results)
+        
+        cached = self._cached(cache_key)
+        if cached is None and self.persistent_cache is not None:
+            cached = await asyncio.to_thread(self._cached_on_disk, cache_key)
+        if cached is not None:
+            self.logger.info(f"Returning cached results for: {keywords}")
+            if cached.stale:
+                self._revalidate_async(cache_key, keywords, search_params)
+            return SearchResult(list(cached.products), cached.stale)
         
         try:
-            self._wait_for_throttle()
-            items = self.api.get_items(asins)
+            products = await self.async_flights.do(
+                cache_key, partial(self._fetch_search_async, cache_key, keywords, search_params)
+            )
+            return SearchResult(list(products), False)
             
-            products = []
-            for item in items:
+        except Exception as e:
+            self.logger.error(f"Amazon API search failed: {e}")
+            return SearchResult([], False)
+    
+    async def search_products_many(self,
+                                   searches: List[Dict[str, Any]],
+                                   limit: int,
+                                   exclude_asins=()) -> SearchResult:
+        """Run several searches concurrently and merge their unique products
+        
+        ``searches`` are keyword arguments for ``search_async``. All of them
+        are scheduled at once through the shared rate limiter and executor;
+        products are ASIN-deduplicated (also against ``exclude_asins``) as
+        each search completes, and searches still pending are cancelled as
+        soon as ``limit`` unique products are in. The result is stale if any
+        merged search was served stale.
+        """
+        seen_asins = set(exclude_asins)
+        products = []
+        stale = False
+        tasks = [asyncio.ensure_future(self.search_async(**search)) for search in searches]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                search = await next_done
+                for product in search.products:
+                    if product.asin not in seen_asins:
+                        seen_asins.add(product.asin)
+                        products.append(product)
+                stale = stale or search.stale
+                
+                if len(products) >= limit:
+                    break
+        finally:
+            # Newest first, so their rate limiter tokens can be given back
+            for task in reversed(tasks):
+                task.cancel()
+        
+        return SearchResult(products[:limit], stale)
+    
+    def _revalidate(self, cache_key, keywords, search_params):
+        """Refresh a stale search in a background thread, once per key"""
+        if not self._start_revalidating(cache_key):
+            return
+        
+        def refresh():
+            try:
+                self.flights.do(
+                    cache_key, partial(self._fetch_search_throttled, cache_key, keywords, search_params)
+                )
+            except Exception as e:
+                self.logger.error(f"Amazon API revalidation failed: {e}")
+            finally:
+                self._revalidating.pop(cache_key, None)
+        
+        thread = threading.Thread(target=refresh, name="amazon-revalidate", daemon=True)
+        self._revalidating[cache_key] = thread
+        thread.start()
+    
+    def _revalidate_async(self, cache_key, keywords, search_params):
+        """Refresh a stale search in a background task, once per key"""
+        if not self._start_revalidating(cache_key):
+            return
+        
+        async def refresh():
+            try:
+                await self.async_flights.do(
+                    cache_key, partial(self._fetch_search_async, cache_key, keywords, search_params)
+                )
+            except Exception as e:
+                self.logger.error(f"Amazon API revalidation failed: {e}")
+            finally:
+                self._revalidating.pop(cache_key, None)
+        
+        # The dict keeps the task referenced until it finishes
+        self._revalidating[cache_key] = asyncio.ensure_future(refresh())
+    
+    def _start_revalidating(self, cache_key) -> bool:
+        with self._revalidating_lock:
+            if cache_key in self._revalidating:
+                return False
+            self._revalidating[cache_key] = None
+            self.revalidations += 1
+            return True
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+    
+    @staticmethod
+    def _search_key(keywords, category, min_price, max_price, max_results) -> str:
+        # Keyword search is case-insensitive, so "Gaming  mouse" and
+        # "gaming mouse" share one cache entry and one in-flight call
+        keywords = ' '.join(keywords.lower().split())
+        return f"{keywords}_{category}_{min_price}_{max_price}_{max_results}"
+    
+    @staticmethod
+    def _search_params(keywords, min_price, max_price, max_results) -> Dict[str, Any]:
+        # Search parameters
+        search_params = {
+            'keywords': keywords,
+            'item_count': max_results
+        }
+        
+        if min_price:
+            search_params['min_price'] = min_price * 100  # Convert to cents
+        if max_price:
+            search_params['max_price'] = max_price * 100  # Convert to cents
+        
+        return search_params
+    
+    def _fetch_search_throttled(self, cache_key, keywords, search_params) -> List[AmazonProduct]:
+        self._wait_for_throttle()
+        return self._fetch_search(cache_key, keywords, search_params)
+    
+    async def _fetch_search_async(self, cache_key, keywords, search_params) -> List[AmazonProduct]:
+        await self._wait_for_throttle_async()
+        return await self._run_blocking(self._fetch_search, cache_key, keywords, search_params)
+    
+    def _fetch_search(self, cache_key, keywords, search_params) -> List[AmazonProduct]:
+        """Call the search API, then parse and cache the products (blocking)"""
+        search_result = self.api.search_items(**search_params)
+        
+        products = []
+        for item in search_result.items:
+            try:
                 product = self._parse_amazon_item(item)
                 if product:
                     products.append(product)
-            
-            return products
-            
+            except Exception as e:
+                self.logger.error(f"Error parsing item: {e}")
+                continue
+        
+        # Cache results
+        self._remember(cache_key, products)
+        
+        self.logger.info(f"Found {len(products)} products for: {keywords}")
+        return products
+    
+    def _cached(self, cache_key) -> Optional[CachedProducts]:
+        return self.cache.get(cache_key)
+    
+    def _cached_on_disk(self, cache_key) -> Optional[CachedProducts]:
+        """Look up the persistent cache and promote a hit to memory (blocking)"""
+        if self.persistent_cache is None:
+            return None
+        
+        try:
+            stored = self.persistent_cache.get(cache_key)
         except Exception as e:
-            self.logger.error(f"Failed to get product details: {e}")
+            self.logger.error(f"Persistent cache read failed: {e}")
+            return None
+        if stored is None:
+            return None
+        
+        data, expires_at = stored
+        products = self._intern([AmazonProduct(**item) for item in data], update=False)
+        cached = CachedProducts(products, expires_at - self.stale_grace)
+        self.cache.put(cache_key, cached, ttl=expires_at - time.time())
+        return cached
+    
+    def _remember(self, cache_key, products):
+        """Cache products in memory and, if enabled, on disk (blocking)
+        
+        Entries are kept ``stale_grace`` seconds past ``cache_ttl`` so they
+        can still be served while being revalidated.
+        """
+        retention = self.cache_ttl + self.stale_grace
+        fresh_until = time.time() + self.cache_ttl
+        self.cache.put(cache_key, CachedProducts(self._intern(products), fresh_until), ttl=retention)
+        if self.persistent_cache is not None:
+            try:
+                self.persistent_cache.put(cache_key, [p.to_dict() for p in products], ttl=retention)
+            except Exception as e:
+                self.logger.error(f"Persistent cache write failed: {e}")
+    
+    def _intern(self, products, update=True) -> tuple:
+        """Swap products for the live instance with the same ASIN
+        
+        With ``update`` the live instance takes the newer offer data, which
+        every cached list holding it then serves.
+        """
+        interned = []
+        with self._products_lock:
+            for product in products:
+                live = self._products.get(product.asin)
+                if live is None:
+                    self._products[product.asin] = live = product
+                elif update and live is not product:
+                    for name in REFRESHED_FIELDS:
+                        setattr(live, name, getattr(product, name))
+                interned.append(live)
+        return tuple(interned)
+    
+    def record_served(self, asins):
+        """Count ASINs shown to users; the most served are refreshed first"""
+        with self._served_lock:
+            self.served.update(asins)
+            if len(self.served) > MAX_TRACKED_ASINS:
+                self.served = Counter(dict(self.served.most_common(MAX_TRACKED_ASINS // 2)))
+    
+    def start_refresher(self, share: float):
+        """Keep served products' offers fresh in a daemon thread
+        
+        Every refresh is one ``get_items`` call for up to ITEMS_BATCH_SIZE
+        of the most served ASINs. The thread spends at most ``share`` of
+        the rate budget and skips its turn while interactive requests are
+        waiting for a token.
+        """
+        budget = TokenBucket(rate=self.rate_limiter.rate * share)
+        
+        def refresh_forever():
+            while True:
+                budget.acquire()
+                if self.rate_limiter.queued:
+                    continue
+                try:
+                    self.refresh_served()
+                except Exception as e:
+                    self.logger.error(f"Product refresh failed: {e}")
+        
+        threading.Thread(target=refresh_forever, name="amazon-refresh", daemon=True).start()
+    
+    def refresh_served(self) -> int:
+        """Re-fetch one batch of the most served ASINs, bypassing the cache"""
+        with self._served_lock:
+            batch = [asin for asin, _ in self.served.most_common(ITEMS_BATCH_SIZE)]
+            for asin in batch:
+                del self.served[asin]
+        if not batch:
+            return 0
+        
+        self._wait_for_throttle()
+        refreshed = self._fetch_items(batch)
+        self.refreshed_items += len(refreshed)
+        self.logger.info(f"Refreshed {len(refreshed)} of {len(batch)} served products")
+        return len(refreshed)
+    
+    def get_product_details(self, asins: List[str]) -> List[AmazonProduct]:
+        """Get detailed product information by ASINs"""
+        
+        if not self.api:
+            return []
+        
+        products = self._cached_items(asins, disk=True)
+        missing = [asin for asin in asins if asin not in products]
+        if missing:
+            def fetch():
+                self._wait_for_throttle()
+                return self._fetch_items(missing)
+            
+            try:
+                products.update(self.flights.do(self._items_key(missing), fetch))
+                
+            except Exception as e:
+                self.logger.error(f"Failed to get product details: {e}")
+        
+        return [products[asin] for asin in asins if asin in products]
+    
+    async def get_product_details_async(self, asins: List[str]) -> List[AmazonProduct]:
+        """Get detailed product information by ASINs without blocking the event loop"""
+        
+        if not self.api:
             return []
+        
+        products = self._cached_items(asins, disk=False)
+        missing = [asin for asin in asins if asin not in products]
+        if missing and self.persistent_cache is not None:
+            products.update(await asyncio.to_thread(self._cached_items, missing, True))
+            missing = [asin for asin in asins if asin not in products]
+        if missing:
+            async def fetch():
+                await self._wait_for_throttle_async()
+                return await self._run_blocking(self._fetch_items, missing)
+            
+            try:
+                products.update(await self.async_flights.do(self._items_key(missing), fetch))
+                
+            except Exception as e:
+                self.logger.error(f"Failed to get product details: {e}")
+        
+        return [products[asin] for asin in asins if asin in products]
+    
+    def _cached_items(self, asins, disk) -> Dict[str, AmazonProduct]:
+        """Fresh cached item details by ASIN (the disk lookup blocks)"""
+        products = {}
+        for asin in asins:
+            cached = self._cached(f"item:{asin}")
+            if cached is None and disk:
+                cached = self._cached_on_disk(f"item:{asin}")
+            if cached is not None and cached.products and not cached.stale:
+                products[asin] = cached.products[0]
+        return products
+    
+    @staticmethod
+    def _items_key(asins) -> str:
+        return "items:" + ",".join(sorted(set(asins)))
+    
+    def _fetch_items(self, asins) -> Dict[str, AmazonProduct]:
+        """Call the item lookup API, then parse and cache each item (blocking)"""
+        products = {}
+        for product in self._parse_items(self.api.get_items(asins)):
+            self._remember(f"item:{product.asin}", [product])
+            products[product.asin] = product
+        return products
+    
+    def _parse_items(self, items) -> List[AmazonProduct]:
+        products = []
+        for item in items:
+            product = self._parse_amazon_item(item)
+            if product:
+                products.append(product)
+        
+        return products
     
     def _parse_amazon_item(self, item) -> Optional[AmazonProduct]:
         """Parse Amazon API item response into AmazonProduct"""
@@ -208,12 +667,15 @@ class AmazonAPIManager:
             # Price information
             price = 0.0
             currency = 'USD'
+            availability = 'Available'
             
             if hasattr(item, 'offers') and item.offers and item.offers.listings:
                 listing = item.offers.listings[0]
                 if hasattr(listing, 'price') and listing.price:
                     price = float(listing.price.amount or 0) / 100  # Convert from cents
                     currency = getattr(listing.price, 'currency', 'USD')
+                if getattr(listing, 'availability', None):
+                    availability = getattr(listing.availability, 'message', '') or availability
             
             # Images
             image_url = ''
@@ -260,6 +722,7 @@ class AmazonAPIManager:
                 rating=rating,
                 review_count=review_count,
                 affiliate_url=affiliate_url,
+                availability=availability,
                 brand=brand,
                 color=color,
                 keywords=[]
@@ -269,14 +732,60 @@ class AmazonAPIManager:
             self.logger.error(f"Error parsing Amazon item: {e}")
             return None
     
+    @property
+    def api_available(self) -> bool:
+        return self.api is not None
+    
     def get_api_status(self) -> Dict[str, Any]:
-        """Get API status information"""
+        """Get API status information, including persistent cache stats (a SQLite query)"""
         return {
-            'api_available': self.api is not None,
+            'api_available': self.api_available,
             'cache_entries': len(self.cache),
+            'cache': self.cache.stats(),
+            'persistent_cache': self.persistent_cache.stats() if self.persistent_cache else None,
             'last_request_time': self.last_request_time,
-            'throttle_delay': self.throttle_delay
+            'throttle_delay': self.throttle_delay,
+            'queued_requests': self.rate_limiter.queued,
+            'max_concurrency': self.max_concurrency,
+            'coalesced_requests': self.flights.coalesced + self.async_flights.coalesced,
+            'refresh_share': self.refresh_share,
+            'refresh_backlog': len(self.served),
+            'refreshed_items': self.refreshed_items,
+            'stale_grace': self.stale_grace,
+            'revalidations': self.revalidations
         }
 
-# Global API manager instance
-amazon_api = AmazonAPIManager()
+# PA-API GetItems accepts at most 10 ASINs per call
+ITEMS_BATCH_SIZE = 10
+MAX_TRACKED_ASINS = 10000
+# Offer data taken over by the live instance when an item is re-fetched
+REFRESHED_FIELDS = ('price', 'currency', 'availability', 'rating', 'review_count')
+
+def _products_size(entry: CachedProducts) -> int:
+    """Approximate memory held by a cached tuple of AmazonProducts, in bytes"""
+    size = sys.getsizeof(entry) + sys.getsizeof(entry.products)
+    for product in entry.products:
+        size += sys.getsizeof(product) + sum(
+            sys.getsizeof(getattr(product, f.name)) for f in fields(product)
+        )
+    return size
+
+# Global API manager instance. Creating it opens the persistent cache and
+# starts background threads, so that waits until it is first used
+_manager: Optional[AmazonAPIManager] = None
+_manager_lock = threading.Lock()
+
+def get_amazon_api() -> AmazonAPIManager:
+    """The shared AmazonAPIManager, created on first call"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = AmazonAPIManager()
+    return _manager
+
+def __getattr__(name):
+    # `from amazon_api import amazon_api` still works; it creates the manager
+    if name == 'amazon_api':
+        return get_amazon_api()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,53 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import random
 from datetime import datetime
+import logging
 import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# pandas, scikit-learn and SciPy are only needed to build or load the
+# index, so index_bundle, dense_index and incremental_index are imported
+# where they are used; that keeps importing this module fast
+from feedback_store import FeedbackWriter, build_feedback_row
+from gift_index import PRICE_DECIMALS, top_k
+from micro_batcher import MicroBatcher
+from ttl_cache import TTLCache
+from worker_pool import PoolSaturated, WorkerPool
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Gift Guru API", description="AI-powered gift recommendations", version="1.0.0")
 
+# 'eager' builds the recommender while this module is imported; 'lazy' keeps
+# the import cheap and builds it in the background once the server starts,
+# answering 503 until it is ready so the process can take traffic sooner
+STARTUP_MODE = os.getenv('STARTUP_MODE', 'eager')
+if STARTUP_MODE not in ('eager', 'lazy'):
+    raise ValueError(f"Unknown STARTUP_MODE {STARTUP_MODE!r}, expected 'eager' or 'lazy'")
+
+# Answered while the recommender is still loading
+UNGATED_PATHS = {'/', '/health', '/ready', '/docs', '/openapi.json'}
+
+async def readiness_gate(request: Request, call_next):
+    if recommender is None and request.url.path not in UNGATED_PATHS:
+        detail = "Recommender failed to load" if recommender_error else "Recommender is starting, please retry shortly"
+        return JSONResponse(status_code=503, content={"detail": detail}, headers={"Retry-After": "1"})
+    return await call_next(request)
+
+if STARTUP_MODE == 'lazy':
+    # Added before CORS so that middleware also wraps these 503s
+    app.middleware("http")(readiness_gate)
+
 # CORS middleware for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +71,14 @@ class FeedbackRequest(BaseModel):
     recommendations: List[dict]
     ratings: List[int]
 
+class ProductRequest(BaseModel):
+    product_name: str
+    price: float
+    category: str
+    tags: str = ""
+    description: str = ""
+    link: str = ""
+
 class GiftRecommendation(BaseModel):
     name: str
     price: float
@@ -44,9 +88,54 @@ class GiftRecommendation(BaseModel):
     similarity_score: float
     malayali_phrase: str
 
+# Profiles scored together per chunk in get_batch_recommendations
+BATCH_CHUNK_SIZE = 1024
+
+class Recommendation:
+    """One ranked gift, kept in the result cache until it is served"""
+    
+    __slots__ = ('name', 'price', 'description', 'link', 'category', 'similarity_score')
+    
+    def __init__(self, name, price, description, link, category, similarity_score):
+        self.name = name
+        self.price = price
+        self.description = description
+        self.link = link
+        self.category = category
+        self.similarity_score = similarity_score
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
 class GiftRecommender:
-    def __init__(self):
+    # Scoring engines for get_recommendations: 'exact' scores every gift in
+    # budget, 'maxscore' prunes with the inverted index (same top-k) and
+    # 'dense' matches in the SVD latent space of the dense index
+    ENGINES = ('exact', 'maxscore', 'dense')
+    
+    def __init__(self, index_mode='bundle', engine='exact', dense_dimensions=0, dense_precision='float32',
+                 cache_size=1024, cache_ttl=300):
+        # 'bundle' serves the prebuilt index; 'incremental' also accepts
+        # product adds/removes at runtime without refitting the vectorizer
+        self.index_mode = index_mode
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scoring engine {engine!r}, expected one of {self.ENGINES}")
+        self.engine = engine
+        # The dense index is only built when asked for (0 = off)
+        if engine == 'dense' and not dense_dimensions:
+            from dense_index import DEFAULT_DIMENSIONS
+            dense_dimensions = DEFAULT_DIMENSIONS
+        self.dense_dimensions = dense_dimensions
+        self.dense_precision = dense_precision
+        # Ranked results per (catalog version, normalized profile, budget, ...);
+        # a cache_size of 0 disables caching
+        self.result_cache = TTLCache(max_entries=cache_size, ttl=cache_ttl)
+        self._cached_version = None
+        self.incremental = None
+        self._reload_lock = threading.Lock()
+        self._catalog_stat = None
         self.load_gift_database()
+        self.feedback_writer = None
         self.malayali_phrases = [
             "This is mallu-level epic! 🔥",
             "Adipoli choice, machane! 👌",
@@ -59,131 +148,537 @@ class GiftRecommender:
         ]
     
     def load_gift_database(self):
-        """Load and prepare the gift database"""
+        """Load the gift index, refitting only if the catalog changed
+        
+        In incremental mode the catalog is re-indexed from the CSV, which
+        discards products added or removed through the API.
+        """
+        from index_bundle import find_catalog, load_index
+        
         try:
             # Try relative path first, then absolute path
-            try:
-                self.gifts_df = pd.read_csv('../gift_database.csv')
-            except FileNotFoundError:
-                self.gifts_df = pd.read_csv('gift_database.csv')
-            
-            # Create combined features for similarity matching
-            self.gifts_df['combined_features'] = (
-                self.gifts_df['category'].fillna('') + ' ' +
-                self.gifts_df['tags'].fillna('') + ' ' +
-                self.gifts_df['description'].fillna('')
-            )
-            
-            # Initialize TF-IDF vectorizer
-            self.vectorizer = TfidfVectorizer(
-                stop_words='english',
-                ngram_range=(1, 2),
-                max_features=1000
-            )
-            
-            # Fit vectorizer on gift features
-            self.gift_vectors = self.vectorizer.fit_transform(self.gifts_df['combined_features'])
-            
+            catalog_path = find_catalog()
+            catalog_stat = self._stat_catalog(catalog_path)
+            if self.index_mode == 'incremental':
+                from incremental_index import IncrementalGiftIndex
+                self.incremental = IncrementalGiftIndex(catalog_path, 'recommender')
+            else:
+                snapshot = load_index(catalog_path, 'recommender')
+                if self.dense_dimensions:
+                    from dense_index import DenseIndex
+                    dense = DenseIndex(
+                        snapshot.index.postings.T, self.dense_dimensions, self.dense_precision
+                    )
+                    snapshot = snapshot._replace(dense=dense)
+                self._snapshot = snapshot
         except FileNotFoundError:
             raise HTTPException(status_code=500, detail="Gift database not found")
+        
+        self._catalog_stat = catalog_stat
+    
+    @property
+    def snapshot(self):
+        # The vectorizer and index are published together as one immutable
+        # snapshot; swapping the reference is atomic, and requests that already
+        # hold the previous snapshot finish on it without any locking
+        if self.incremental is not None:
+            return self.incremental.snapshot
+        return self._snapshot
+    
+    @property
+    def vectorizer(self):
+        return self.snapshot.vectorizer
+    
+    @property
+    def gift_index(self):
+        return self.snapshot.index
+    
+    @property
+    def total_gifts(self):
+        if self.incremental is not None:
+            return len(self.incremental)
+        return len(self.snapshot.index)
+    
+    @property
+    def catalog_version(self):
+        return self.snapshot.content_hash[:12]
+    
+    @property
+    def reloading(self):
+        return self._reload_lock.locked()
+    
+    def reload_async(self):
+        """Rebuild the gift index in the background and swap it in when ready
+        
+        Returns False if a reload is already in progress.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        threading.Thread(target=self._reload, name="catalog-reload", daemon=True).start()
+        return True
+    
+    def watch_catalog(self, interval):
+        """Poll the catalog file and hot-reload it whenever it changes"""
+        from index_bundle import find_catalog
+        
+        def watch():
+            previous_stat = self._catalog_stat
+            while True:
+                time.sleep(interval)
+                try:
+                    catalog_stat = self._stat_catalog(find_catalog())
+                except OSError:
+                    continue
+                
+                # Wait for the file to stop changing so half-written edits are skipped
+                if catalog_stat != self._catalog_stat and catalog_stat == previous_stat:
+                    self.reload_async()
+                previous_stat = catalog_stat
+        
+        threading.Thread(target=watch, name="catalog-watcher", daemon=True).start()
+    
+    def _reload(self):
+        import index_bundle
+        
+        previous_version = self.catalog_version
+        try:
+            # Refitting is GIL-heavy Python tokenization, so stale bundles are
+            # rebuilt in a child process to keep request latency flat here
+            catalog_path = index_bundle.find_catalog()
+            if self.index_mode != 'incremental':
+                # Every worker's watcher sees the edit; the first to get the
+                # lock rebuilds and the rest then find the bundle current
+                with index_bundle.rebuild_lock(catalog_path, 'recommender'):
+                    if not index_bundle.bundle_is_current(catalog_path, 'recommender'):
+                        subprocess.run(
+                            [sys.executable, os.path.abspath(index_bundle.__file__),
+                             'build-index', '--name', 'recommender', '--no-lock', catalog_path],
+                            check=True
+                        )
+            self.load_gift_database()
+            logger.info(f"Catalog reloaded: {previous_version} -> {self.catalog_version}")
+        except Exception as e:
+            logger.error(f"Catalog reload failed, still serving {previous_version}: {e}")
+        finally:
+            self._reload_lock.release()
+    
+    @staticmethod
+    def _stat_catalog(catalog_path):
+        stat = os.stat(catalog_path)
+        return stat.st_size, stat.st_mtime_ns
+    
+    def add_product(self, product):
+        """Index a new catalog row (incremental mode only); returns its id"""
+        return self._require_incremental().add_product(product)
+    
+    def remove_product(self, product_id):
+        """Drop a product from the index (incremental mode only)"""
+        return self._require_incremental().remove_product(product_id)
+    
+    def _require_incremental(self):
+        if self.incremental is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Product updates need INDEX_MODE=incremental; edit gift_database.csv instead"
+            )
+        return self.incremental
     
     def create_user_profile(self, age_range, gender, interests, occasion, budget):
         """Create user profile for matching"""
         profile_text = f"{age_range} {gender} {interests} {occasion}"
         return profile_text.lower()
     
-    def get_recommendations(self, user_profile, budget_min, budget_max, num_recommendations=5):
-        """Get gift recommendations based on user profile"""
-        if self.gifts_df.empty:
-            return []
+    def get_recommendations(self, user_profile, budget_min, budget_max, num_recommendations=5, engine=None):
+        """Get gift recommendations based on user profile
         
-        # Filter by budget
-        budget_filtered = self.gifts_df[
-            (self.gifts_df['price'] >= budget_min) & 
-            (self.gifts_df['price'] <= budget_max)
-        ]
+        ``engine`` overrides the configured scoring engine for this call.
+        Ranked results are cached per catalog version; the Malayali phrase
+        is picked fresh for every response.
+        """
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scoring engine {engine!r}, expected one of {self.ENGINES}")
         
-        if budget_filtered.empty:
-            # If no gifts in budget, expand the range
-            budget_filtered = self.gifts_df[
-                self.gifts_df['price'] <= budget_max + 20
-            ]
+        snapshot = self._cache_snapshot()
+        cache_key = self._cache_key(snapshot, user_profile, budget_min, budget_max, num_recommendations, engine)
+        recommendations = self.result_cache.get(cache_key)
+        if recommendations is None:
+            recommendations = self._rank(
+                snapshot, user_profile, budget_min, budget_max, num_recommendations, engine
+            )
+            self.result_cache.put(cache_key, recommendations)
+        
+        return self._add_phrases(recommendations)
+
+    def _cache_snapshot(self):
+        """Current snapshot, clearing the result cache if it was built for another"""
+        snapshot = self.snapshot
+        if snapshot.content_hash != self._cached_version:
+            # The catalog index changed; every cached ranking is stale
+            self.result_cache.clear()
+            self._cached_version = snapshot.content_hash
+        return snapshot
+
+    def _cache_key(self, snapshot, user_profile, budget_min, budget_max, num_recommendations, engine):
+        return (
+            snapshot.content_hash, self._normalize_profile(user_profile),
+            budget_min, budget_max, num_recommendations, engine
+        )
+
+    def _rank(self, snapshot, user_profile, budget_min, budget_max, num_recommendations, engine):
+        """Top gifts for one profile, without Malayali phrases"""
+        if self.incremental is not None:
+            return self._format_records(
+                snapshot.search(user_profile, budget_min, budget_max, num_recommendations)
+            )
         
-        if budget_filtered.empty:
+        if len(snapshot.index) == 0:
+            return []
+        
+        # Budget filtering is two binary searches over the price-ordered index
+        start, end = snapshot.index.budget_range(budget_min, budget_max)
+        
+        if start == end:
             return []
         
         # Vectorize user profile
-        user_vector = self.vectorizer.transform([user_profile])
+        user_vector = snapshot.vectorizer.transform([user_profile])
         
-        # Get similarity scores for budget-filtered items
-        budget_indices = budget_filtered.index
-        filtered_vectors = self.gift_vectors[budget_indices]
+        if engine == 'maxscore':
+            positions, similarity_scores = snapshot.index.top_k_between(
+                user_vector, start, end, num_recommendations
+            )
+            return self._format_recommendations(snapshot.index, positions, similarity_scores)
         
-        similarity_scores = cosine_similarity(user_vector, filtered_vectors).flatten()
+        # Get similarity scores for budget-filtered items
+        if engine == 'dense':
+            if snapshot.dense is None:
+                raise ValueError("Dense index not built; set DENSE_DIMENSIONS or SCORING_ENGINE=dense")
+            similarity_scores = snapshot.dense.score_between(user_vector, start, end)
+        else:
+            similarity_scores = snapshot.index.score_between(user_vector, start, end)
         
         # Get top recommendations
-        top_indices = similarity_scores.argsort()[-num_recommendations:][::-1]
+        top_indices = top_k(similarity_scores, num_recommendations)
         
-        recommendations = []
-        for idx in top_indices:
-            gift_idx = budget_indices[idx]
-            gift = self.gifts_df.iloc[gift_idx]
+        return self._format_recommendations(
+            snapshot.index, start + top_indices, similarity_scores[top_indices]
+        )
+
+    @staticmethod
+    def _normalize_profile(user_profile):
+        # The vectorizers only see lowercase word tokens of 2+ characters, so
+        # profiles differing in case, spacing or punctuation rank identically
+        return ' '.join(re.findall(r'\b\w\w+\b', user_profile.lower()))
+
+    def get_batch_recommendations(self, queries, num_recommendations=5, engine=None):
+        """Get recommendations for many (user_profile, budget_min, budget_max) queries at once
+        
+        Scored with the same engine as get_recommendations, so each result
+        matches the single query. Queries found in the result cache are
+        answered from it; the rest are ranked together by ``_rank_batch``
+        and cached like single queries.
+        """
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scoring engine {engine!r}, expected one of {self.ENGINES}")
+        
+        snapshot = self._cache_snapshot()
+        cache_keys = [
+            self._cache_key(snapshot, profile, budget_min, budget_max, num_recommendations, engine)
+            for profile, budget_min, budget_max in queries
+        ]
+        results = [self.result_cache.get(cache_key) for cache_key in cache_keys]
+        
+        misses = [i for i, recommendations in enumerate(results) if recommendations is None]
+        ranked = self._rank_batch(snapshot, [queries[i] for i in misses], num_recommendations, engine)
+        for i, recommendations in zip(misses, ranked):
+            results[i] = recommendations
+            self.result_cache.put(cache_keys[i], recommendations)
+        
+        return [self._add_phrases(recommendations) for recommendations in results]
+
+    def _rank_batch(self, snapshot, queries, num_recommendations, engine):
+        """Top gifts for many profiles, without Malayali phrases
+        
+        Profiles are vectorized together and scored per BATCH_CHUNK_SIZE
+        profiles: with 'exact', one sparse matrix product against the catalog
+        per chunk, which bounds the profiles x gifts score matrix when common
+        terms make it dense (TF-IDF rows are L2-normalized, so the dot product
+        equals the cosine similarity used by get_recommendations); with
+        'dense', one projection into the latent space per chunk.
+        """
+        if self.incremental is not None or engine == 'maxscore':
+            # Unmerged products live outside the postings matrix, and MaxScore
+            # prunes per profile
+            return [
+                self._rank(snapshot, profile, budget_min, budget_max, num_recommendations, engine)
+                for profile, budget_min, budget_max in queries
+            ]
+        
+        if engine == 'dense' and snapshot.dense is None:
+            raise ValueError("Dense index not built; set DENSE_DIMENSIONS or SCORING_ENGINE=dense")
+        
+        if len(snapshot.index) == 0 or not queries:
+            return [[] for _ in queries]
+        
+        results = []
+        for chunk_start in range(0, len(queries), BATCH_CHUNK_SIZE):
+            results.extend(self._rank_chunk(
+                snapshot, queries[chunk_start:chunk_start + BATCH_CHUNK_SIZE], num_recommendations, engine
+            ))
+        return results
+
+    def _rank_chunk(self, snapshot, queries, num_recommendations, engine):
+        user_vectors = snapshot.vectorizer.transform([profile for profile, _, _ in queries])
+        if engine == 'dense':
+            embedded = snapshot.dense.embed(user_vectors)
+        else:
+            similarity_matrix = (user_vectors @ snapshot.index.postings).tocsr()
+        
+        results = []
+        for row, (_, budget_min, budget_max) in enumerate(queries):
+            start, end = snapshot.index.budget_range(budget_min, budget_max)
+            
+            if start == end:
+                results.append([])
+                continue
+            
+            if engine == 'dense':
+                similarity_scores = snapshot.dense.score_embedded_between(embedded[row], start, end)
+            else:
+                # Scatter this profile's non-zero scores into its budget slice
+                first, last = similarity_matrix.indptr[row], similarity_matrix.indptr[row + 1]
+                positions = similarity_matrix.indices[first:last]
+                in_budget = (positions >= start) & (positions < end)
+                similarity_scores = np.zeros(end - start)
+                similarity_scores[positions[in_budget] - start] = similarity_matrix.data[first:last][in_budget]
             
-            recommendations.append({
-                'name': gift['product_name'],
-                'price': float(gift['price']),
-                'description': gift['description'],
-                'link': gift['link'],
-                'category': gift['category'],
-                'similarity_score': float(similarity_scores[idx]),
-                'malayali_phrase': random.choice(self.malayali_phrases)
-            })
+            top_indices = top_k(similarity_scores, num_recommendations)
+            results.append(self._format_recommendations(
+                snapshot.index, start + top_indices, similarity_scores[top_indices]
+            ))
+        
+        return results
+
+    def _format_recommendations(self, index, positions, similarity_scores):
+        """Build recommendation payloads for the given price-ordered positions"""
+        names, descriptions = index.columns['product_name'], index.columns['description']
+        links, categories = index.columns['link'], index.columns['category']
+        
+        recommendations = []
+        for position, score in zip(positions.tolist(), similarity_scores.tolist()):
+            recommendations.append(Recommendation(
+                names[position],
+                round(float(index.prices[position]), PRICE_DECIMALS),
+                descriptions[position],
+                links[position],
+                categories[position],
+                score
+            ))
         
         return recommendations
 
+    def _format_records(self, matches):
+        """Build recommendation payloads for (catalog record, score) pairs"""
+        return [
+            Recommendation(
+                record['product_name'],
+                round(float(record['price']), PRICE_DECIMALS),
+                record['description'],
+                record['link'],
+                record['category'],
+                score
+            )
+            for record, score in matches
+        ]
+
+    def _add_phrases(self, recommendations):
+        """Recommendation dicts, each with a random Malayali phrase"""
+        return [
+            {**recommendation.to_dict(), 'malayali_phrase': random.choice(self.malayali_phrases)}
+            for recommendation in recommendations
+        ]
+
     def save_feedback(self, user_data, recommendations, ratings):
-        """Save user feedback to CSV"""
-        feedback_data = {
-            'timestamp': datetime.now().isoformat(),
-            'age_range': user_data.get('age_range', ''),
-            'gender': user_data.get('gender', ''),
-            'interests': user_data.get('interests', ''),
-            'occasion': user_data.get('occasion', ''),
-            'budget': f"${user_data.get('budget_min', 0)}-${user_data.get('budget_max', 0)}",
-            'recommendations': str([r['name'] for r in recommendations]),
-            'ratings': str(ratings),
-            'average_rating': np.mean([r for r in ratings if r > 0]) if any(r > 0 for r in ratings) else 0
-        }
-        
-        feedback_df = pd.DataFrame([feedback_data])
+        """Append user feedback to CSV"""
+        feedback_data = build_feedback_row(
+            datetime.now().isoformat(), user_data, recommendations, ratings
+        )
         
         # Append to existing feedback file or create new one
-        try:
+        if self.feedback_writer is None:
             feedback_file = '../user_feedback.csv'
             if not os.path.exists(feedback_file):
                 feedback_file = 'user_feedback.csv'
-        except:
-            feedback_file = 'user_feedback.csv'
-        if os.path.exists(feedback_file):
-            existing_feedback = pd.read_csv(feedback_file)
-            feedback_df = pd.concat([existing_feedback, feedback_df], ignore_index=True)
+            self.feedback_writer = FeedbackWriter(feedback_file)
         
-        feedback_df.to_csv(feedback_file, index=False)
+        self.feedback_writer.append(feedback_data)
         return True
 
-# Initialize the recommender
-recommender = GiftRecommender()
+RECOMMENDER_CONFIG = dict(
+    index_mode=os.getenv('INDEX_MODE', 'bundle'),
+    engine=os.getenv('SCORING_ENGINE', 'exact'),
+    dense_dimensions=int(os.getenv('DENSE_DIMENSIONS', '0')),
+    dense_precision=os.getenv('DENSE_PRECISION', 'float32'),
+    cache_size=int(os.getenv('RESULT_CACHE_SIZE', '1024')),
+    cache_ttl=float(os.getenv('RESULT_CACHE_TTL', '300'))
+)
+
+recommender = None
+recommender_error = None  # why the last attempt to build it failed, if it did
+_recommender_lock = threading.Lock()
+
+def load_recommender():
+    """Build the shared recommender on first call and return it"""
+    global recommender, recommender_error
+    with _recommender_lock:
+        if recommender is None:
+            started = time.perf_counter()
+            try:
+                recommender = GiftRecommender(**RECOMMENDER_CONFIG)
+            except Exception as e:
+                recommender_error = e
+                raise
+            recommender_error = None
+            logger.info(f"Recommender ready in {time.perf_counter() - started:.2f}s")
+    return recommender
+
+if STARTUP_MODE == 'eager':
+    load_recommender()
+
+# Scoring runs in a bounded pool so one slow request cannot stall the event
+# loop; when the queue is full requests are turned away with a 503
+scoring_pool_mode = os.getenv('SCORING_POOL', 'thread')
+if scoring_pool_mode == 'process' and RECOMMENDER_CONFIG['index_mode'] == 'incremental':
+    # Runtime product edits only exist in this process
+    logger.warning("SCORING_POOL=process is not supported with INDEX_MODE=incremental, using threads")
+    scoring_pool_mode = 'thread'
+scoring_pool = WorkerPool(
+    workers=int(os.getenv('SCORING_WORKERS', '4')),
+    max_queue=int(os.getenv('SCORING_QUEUE', '64')),
+    mode=scoring_pool_mode,
+    name='scoring'
+)
+
+def _score(catalog_version, method, *args):
+    """Call a recommender method inside a scoring pool worker"""
+    # A worker process keeps the recommender it started with (or builds its
+    # own if it was started before the server's was ready); catch up with
+    # catalog reloads the server has done since
+    recommender = load_recommender()
+    if catalog_version is not None and recommender.catalog_version != catalog_version:
+        recommender.load_gift_database()
+    return getattr(recommender, method)(*args)
+
+async def _run_scoring(method, *args):
+    catalog_version = recommender.catalog_version if scoring_pool.mode == 'process' else None
+    return await scoring_pool.run(_score, catalog_version, method, *args)
+
+async def _score_batch(queries):
+    return await _run_scoring('get_batch_recommendations', queries, 5)
+
+# Opt-in: concurrent /recommendations calls arriving within a few ms are
+# scored together as one chunk of a batch
+recommendation_batcher = None
+if os.getenv('MICRO_BATCHING', '0') == '1':
+    if RECOMMENDER_CONFIG['engine'] != 'maxscore':
+        recommendation_batcher = MicroBatcher(
+            _score_batch,
+            max_batch_size=int(os.getenv('MICRO_BATCH_SIZE', '32')),
+            max_wait=float(os.getenv('MICRO_BATCH_WAIT_MS', '5')) / 1000
+        )
+    else:
+        # MaxScore prunes per profile, so batching would only add latency
+        logger.warning("MICRO_BATCHING has no effect with SCORING_ENGINE=maxscore; disabled")
+
+def _overloaded(error):
+    return HTTPException(
+        status_code=503,
+        detail="Too many requests in progress, please retry shortly",
+        headers={"Retry-After": str(error.retry_after)}
+    )
 
 @app.get("/")
 async def root():
     return {"message": "Gift Guru API is running! 🎁✨", "version": "1.0.0"}
 
+@app.on_event("startup")
+async def startup_event():
+    """Build the recommender if startup is lazy, then watch the catalog for edits"""
+    if recommender is None:
+        threading.Thread(target=_start_recommender, name="recommender-load", daemon=True).start()
+    else:
+        _watch_catalog()
+
+def _start_recommender():
+    try:
+        load_recommender()
+    except Exception as e:
+        logger.error(f"Failed to load the recommender: {e}")
+        return
+    _watch_catalog()
+
+def _watch_catalog():
+    watch_interval = float(os.getenv('CATALOG_WATCH_INTERVAL', '5'))
+    # A reload would discard products added through the API
+    if watch_interval > 0 and recommender.incremental is None:
+        recommender.watch_catalog(watch_interval)
+
+@app.get("/ready")
+async def readiness_check():
+    """200 once the recommender can serve requests, 503 until then"""
+    if recommender is None:
+        return JSONResponse(
+            status_code=503,
+            content={"ready": False, "error": str(recommender_error) if recommender_error else None},
+            headers={"Retry-After": "1"}
+        )
+    return {"ready": True, "catalog_version": recommender.catalog_version}
+
 @app.get("/health")
 async def health_check():
+    if recommender is None:
+        return {
+            "status": "unhealthy" if recommender_error else "starting",
+            "database_loaded": False,
+            "startup_mode": STARTUP_MODE
+        }
+    snapshot = recommender.snapshot
     return {
         "status": "healthy",
-        "database_loaded": len(recommender.gifts_df) > 0,
-        "total_gifts": len(recommender.gifts_df)
+        "database_loaded": recommender.total_gifts > 0,
+        "total_gifts": recommender.total_gifts,
+        "catalog_version": snapshot.content_hash[:12],
+        "index_mode": recommender.index_mode,
+        "reloading": recommender.reloading,
+        "startup_mode": STARTUP_MODE
+    }
+
+def _check_admin_token(x_admin_token, required=False):
+    """Reject admin calls without the ADMIN_TOKEN
+
+    Without an ADMIN_TOKEN configured, ``required`` calls are refused
+    outright and the others are let through.
+    """
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token:
+        if required:
+            raise HTTPException(status_code=403, detail="ADMIN_TOKEN is not configured")
+        return
+    if x_admin_token != admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/reload", status_code=202)
+async def reload_catalog(x_admin_token: Optional[str] = Header(default=None)):
+    """Rebuild the gift index from the catalog and swap it in without downtime"""
+    _check_admin_token(x_admin_token)
+    
+    started = recommender.reload_async()
+    return {
+        "status": "reloading" if started else "already_reloading",
+        "catalog_version": recommender.catalog_version
     }
 
 @app.post("/recommendations", response_model=List[GiftRecommendation])
@@ -200,12 +695,18 @@ async def get_recommendations(request: GiftRequest):
         )
         
         # Get recommendations
-        recommendations = recommender.get_recommendations(
-            user_profile,
-            request.budget_min,
-            request.budget_max,
-            num_recommendations=5
-        )
+        if recommendation_batcher is not None:
+            recommendations = await recommendation_batcher.submit(
+                (user_profile, request.budget_min, request.budget_max)
+            )
+        else:
+            recommendations = await _run_scoring(
+                'get_recommendations',
+                user_profile,
+                request.budget_min,
+                request.budget_max,
+                5
+            )
         
         if not recommendations:
             raise HTTPException(
@@ -215,14 +716,74 @@ async def get_recommendations(request: GiftRequest):
         
         return recommendations
         
+    except PoolSaturated as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
 
+# Largest /recommendations/batch body accepted, in profiles
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '10000'))
+
+@app.post("/recommendations/batch", response_model=List[List[GiftRecommendation]])
+async def get_batch_recommendations(requests: List[GiftRequest]):
+    """Get recommendations for many profiles at once (e.g. email campaigns)
+    
+    Results are returned in request order; profiles with no matching gifts
+    get an empty list instead of failing the whole batch. Batches larger
+    than MAX_BATCH_SIZE are rejected with a 413; split them client-side.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(requests)} profiles exceeds the limit of {MAX_BATCH_SIZE}"
+        )
+    
+    try:
+        queries = [
+            (
+                recommender.create_user_profile(
+                    request.age_range,
+                    request.gender,
+                    request.interests,
+                    request.occasion,
+                    request.budget_max
+                ),
+                request.budget_min,
+                request.budget_max
+            )
+            for request in requests
+        ]
+        
+        return await _run_scoring('get_batch_recommendations', queries, 5)
+        
+    except PoolSaturated as e:
+        raise _overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
+
+@app.post("/products", status_code=201)
+async def add_product(request: ProductRequest, x_admin_token: Optional[str] = Header(default=None)):
+    """Add a gift to the live index (INDEX_MODE=incremental)"""
+    _check_admin_token(x_admin_token, required=True)
+    product_id = recommender.add_product(request.dict())
+    return {"id": product_id, "catalog_version": recommender.catalog_version}
+
+@app.delete("/products/{product_id}")
+async def remove_product(product_id: int, x_admin_token: Optional[str] = Header(default=None)):
+    """Remove a gift from the live index (INDEX_MODE=incremental)"""
+    _check_admin_token(x_admin_token, required=True)
+    if not recommender.remove_product(product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return {"id": product_id, "catalog_version": recommender.catalog_version}
+
 @app.post("/feedback")
 async def submit_feedback(request: FeedbackRequest):
     """Submit user feedback for recommendations"""
     try:
-        success = recommender.save_feedback(
+        # The write blocks on flock and fsync; in the threadpool, concurrent
+        # submissions can share one group commit
+        success = await run_in_threadpool(
+            recommender.save_feedback,
             request.user_data,
             request.recommendations,
             request.ratings
@@ -236,18 +797,28 @@ async def submit_feedback(request: FeedbackRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving feedback: {str(e)}")
 
+def _distinct(column):
+    # Dictionary-encoded columns know their distinct values without a scan
+    if hasattr(column, 'distinct'):
+        return column.distinct()
+    return list(dict.fromkeys(column))
+
 @app.get("/stats")
 async def get_stats():
     """Get database statistics"""
     try:
+        gift_index = recommender.gift_index
         stats = {
-            "total_gifts": len(recommender.gifts_df),
+            "total_gifts": recommender.total_gifts,
             "price_range": {
-                "min": float(recommender.gifts_df['price'].min()),
-                "max": float(recommender.gifts_df['price'].max())
+                "min": round(float(np.nanmin(gift_index.prices)), PRICE_DECIMALS),
+                "max": round(float(np.nanmax(gift_index.prices)), PRICE_DECIMALS)
             },
-            "categories": recommender.gifts_df['category'].unique().tolist(),
-            "malayali_phrases_count": len(recommender.malayali_phrases)
+            "categories": _distinct(gift_index.columns['category']),
+            "malayali_phrases_count": len(recommender.malayali_phrases),
+            "result_cache": recommender.result_cache.stats(),
+            "scoring_pool": scoring_pool.stats(),
+            "micro_batching": recommendation_batcher.stats() if recommendation_batcher else None
         }
         return stats
         
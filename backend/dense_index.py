@@ -0,0 +1,64 @@
+"""Dense latent-semantic gift index built from the TF-IDF matrix"""
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+DEFAULT_DIMENSIONS = 128
+
+
+class DenseIndex:
+    """Gift vectors reduced with truncated SVD, kept in price order
+
+    Rows are L2-normalized and stored contiguously, so scoring a budget
+    block is a single matrix-vector product over a slice view. With
+    ``precision='int8'`` each row is quantized to int8 with its own scale,
+    cutting memory per gift roughly 4x at a small cost in accuracy.
+    """
+
+    def __init__(self, gift_vectors, dimensions=DEFAULT_DIMENSIONS, precision='float32', random_state=42):
+        if precision not in ('float32', 'int8'):
+            raise ValueError(f"Unknown precision {precision!r}, expected 'float32' or 'int8'")
+        self.precision = precision
+
+        # TruncatedSVD needs fewer components than features
+        dimensions = max(1, min(dimensions, gift_vectors.shape[1] - 1))
+        svd = TruncatedSVD(n_components=dimensions, random_state=random_state)
+        vectors = _normalize_rows(svd.fit_transform(gift_vectors).astype(np.float32))
+        self.components = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+
+        if precision == 'int8':
+            self.scales = np.abs(vectors).max(axis=1) / 127
+            self.scales[self.scales == 0] = 1
+            self.vectors = np.round(vectors / self.scales[:, None]).astype(np.int8)
+            self.scales = self.scales.astype(np.float32)
+        else:
+            self.scales = None
+            self.vectors = np.ascontiguousarray(vectors)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def bytes_per_gift(self):
+        scale_bytes = self.scales.itemsize if self.scales is not None else 0
+        return self.vectors.shape[1] * self.vectors.itemsize + scale_bytes
+
+    def embed(self, user_vectors):
+        """Project TF-IDF profile vectors (one per row) into the latent space"""
+        return _normalize_rows(np.asarray(user_vectors @ self.components, dtype=np.float32))
+
+    def score_between(self, user_vector, start, end):
+        """Cosine similarity of one TF-IDF profile to the gifts at positions [start, end)"""
+        return self.score_embedded_between(self.embed(user_vector)[0], start, end)
+
+    def score_embedded_between(self, query, start, end):
+        """``score_between`` for a profile already projected with ``embed``"""
+        if self.scales is None:
+            return self.vectors[start:end] @ query
+        return (self.vectors[start:end] @ query) * self.scales[start:end]
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
@@ -1,17 +1,18 @@
 """Enhanced FastAPI backend with Amazon API integration"""
 
-import pandas as pd
+import os
+import numbers
 import numpy as np
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
-from amazon_api import amazon_api, AmazonProduct
+from amazon_api import AmazonApi, SearchResult, get_amazon_api
+from gift_index import top_k
+from worker_pool import PoolSaturated, WorkerPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -49,6 +50,7 @@ class RecommendationResponse(BaseModel):
     total_found: int
     response_time: float
     data_source: str  # "amazon_api" or "local_database"
+    data_freshness: Optional[str] = None  # "fresh" or "stale" for amazon_api
     malayali_humor: Optional[str] = None
 
 class FeedbackRequest(BaseModel):
@@ -57,22 +59,23 @@ class FeedbackRequest(BaseModel):
     user_profile: Dict[str, Any]
 
 # Global variables
-local_df = None
 tfidf_vectorizer = None
-tfidf_matrix = None
+local_index = None  # price-ordered TF-IDF index of the local catalog
 
 def load_local_database():
     """Load local gift database as fallback"""
-    global local_df, tfidf_vectorizer, tfidf_matrix
+    global tfidf_vectorizer, local_index
+    
+    # Imported here so pandas and scikit-learn load at startup, not on import
+    from index_bundle import load_index
     
     try:
-        local_df = pd.read_csv('gift_database.csv')
-        
-        # Create TF-IDF matrix for local products
-        tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        tfidf_matrix = tfidf_vectorizer.fit_transform(local_df['tags'])
+        # Prebuilt bundle; the vectorizer is only refitted if the CSV changed
+        bundle = load_index('gift_database.csv', 'local')
+        tfidf_vectorizer = bundle.vectorizer
+        local_index = bundle.index
         
-        logger.info(f"Loaded {len(local_df)} local products")
+        logger.info(f"Loaded {len(local_index)} local products")
         return True
         
     except Exception as e:
@@ -92,10 +95,10 @@ def get_malayali_humor() -> str:
     
     return np.random.choice(humor_options)
 
-def search_amazon_products(interests: str, 
-                         age_group: str,
-                         budget: List[int],
-                         max_results: int = 10) -> List[AmazonProduct]:
+async def search_amazon_products(interests: str, 
+                                 age_group: str,
+                                 budget: List[int],
+                                 max_results: int = 10) -> SearchResult:
     """Search Amazon for relevant products"""
     
     # Enhanced keyword generation based on age group
@@ -110,73 +113,71 @@ def search_amazon_products(interests: str,
     # Combine user interests with age-appropriate keywords
     search_keywords = f"{interests} {' '.join(age_keywords.get(age_group, []))}"
     
-    # Multiple search strategies
-    products = []
-    
     # Primary search with user interests
-    primary_results = amazon_api.search_products(
+    primary = await get_amazon_api().search_async(
         keywords=search_keywords,
         min_price=budget[0],
         max_price=budget[1],
         max_results=max_results
     )
-    products.extend(primary_results)
-    
-    # If not enough results, try broader searches
-    if len(products) < max_results // 2:
-        # Search by interest categories
-        interest_words = interests.lower().split()
-        for word in interest_words[:3]:  # Top 3 interest words
-            if len(word) > 3:  # Skip short words
-                additional_results = amazon_api.search_products(
-                    keywords=f"{word} gift",
-                    min_price=budget[0],
-                    max_price=budget[1],
-                    max_results=3
-                )
-                products.extend(additional_results)
-                
-                if len(products) >= max_results:
-                    break
     
     # Remove duplicates based on ASIN
     seen_asins = set()
     unique_products = []
-    for product in products:
+    stale = primary.stale
+    for product in primary.products:
         if product.asin not in seen_asins:
             seen_asins.add(product.asin)
             unique_products.append(product)
     
-    return unique_products[:max_results]
+    # If not enough results, try broader searches by interest category.
+    # They run concurrently and stop once max_results products are in
+    if len(unique_products) < max_results // 2:
+        interest_words = interests.lower().split()
+        fallback_searches = [
+            {
+                'keywords': f"{word} gift",
+                'min_price': budget[0],
+                'max_price': budget[1],
+                'max_results': 3
+            }
+            for word in interest_words[:3]  # Top 3 interest words
+            if len(word) > 3  # Skip short words
+        ]
+        fallback = await get_amazon_api().search_products_many(
+            fallback_searches,
+            limit=max_results - len(unique_products),
+            exclude_asins=seen_asins
+        )
+        unique_products.extend(fallback.products)
+        stale = stale or fallback.stale
+    
+    return SearchResult(unique_products[:max_results], stale)
 
 def search_local_products(interests: str, budget: List[int], max_results: int = 10) -> List[Dict]:
     """Search local database for products"""
-    if local_df is None or tfidf_vectorizer is None:
+    if local_index is None or tfidf_vectorizer is None:
         return []
     
     try:
-        # Filter by budget
-        budget_filtered = local_df[
-            (local_df['price'] >= budget[0]) & 
-            (local_df['price'] <= budget[1])
-        ].copy()
+        # Filter by budget (a contiguous block of the price-ordered index)
+        start, end = local_index.price_range(budget[0], budget[1])
         
-        if budget_filtered.empty:
+        if start == end:
             return []
         
-        # TF-IDF similarity matching
+        # TF-IDF similarity against the precomputed catalog vectors; only the
+        # postings of the query's terms are read
         user_interests_vector = tfidf_vectorizer.transform([interests])
-        budget_tfidf = tfidf_vectorizer.transform(budget_filtered['tags'])
-        
-        similarities = cosine_similarity(user_interests_vector, budget_tfidf).flatten()
-        
-        # Add similarity scores
-        budget_filtered.loc[:, 'similarity'] = similarities
+        similarities = local_index.score_between(user_interests_vector, start, end)
         
-        # Sort by similarity and get top results
-        top_results = budget_filtered.nlargest(max_results, 'similarity')
+        # Get top results by similarity
+        top_indices = top_k(similarities, max_results)
         
-        return top_results.to_dict('records')
+        return [
+            {**local_index.record(start + idx), 'similarity': similarity}
+            for idx, similarity in zip(top_indices.tolist(), similarities[top_indices].tolist())
+        ]
         
     except Exception as e:
         logger.error(f"Local search error: {e}")
@@ -184,67 +185,98 @@ def search_local_products(interests: str, budget: List[int], max_results: int =
 
 def enhance_recommendations_with_ai_insights(products: List[Dict], 
                                            user_profile: Dict) -> List[Dict]:
-    """Add AI-generated insights and compatibility scores"""
+    """Add AI-generated insights and compatibility scores
     
+    Scores and insight flags are computed column-wise over all candidates
+    at once; products whose price, rating or review count is not numeric
+    are passed through unchanged.
+    """
+    if not products:
+        return []
+    
+    try:
+        titles = np.char.lower(np.array([str(product.get('title', '')) for product in products]))
+        prices = _numeric_column(products, 'price')
+        ratings = _numeric_column(products, 'rating')
+        review_counts = _numeric_column(products, 'review_count')
+        valid = ~(np.isnan(prices) | np.isnan(ratings) | np.isnan(review_counts))
+        
+        # Age appropriateness
+        age_scores = np.full(len(products), 0.8)  # Default high score
+        if user_profile.get('age_group') == '13-17':
+            age_scores[np.char.find(titles, 'mature') >= 0] = 0.3
+        elif user_profile.get('age_group') == '50+':
+            age_scores[np.char.find(titles, 'gaming') >= 0] = 0.5
+        
+        # Price appropriateness (closer to middle of budget = higher score)
+        budget = user_profile.get('budget', [20, 100])
+        budget_mid = (budget[0] + budget[1]) / 2
+        if budget[1] == budget[0]:
+            raise ZeroDivisionError("empty budget range")
+        price_scores = np.clip(1 - np.abs(prices - budget_mid) / (budget[1] - budget[0]), 0.2, 1.0)
+        
+        # Overall compatibility
+        compatibility = np.round((age_scores + price_scores) / 2 * 100, 1)
+        
+        # AI insights based on product and user profile
+        below_mid = prices < budget_mid
+        insight_flags = np.stack([
+            ratings > 4.0,
+            review_counts > 100,
+            below_mid,
+            (np.char.find(titles, 'premium') >= 0) | (prices > budget_mid * 1.5)
+        ], axis=1)
+        
+        reason = f"Matches your interest in {user_profile.get('interests', 'gifts').split()[0]}"
+        
+    except Exception as e:
+        logger.error(f"Enhancement error: {e}")
+        return list(products)
+    
+    # Enhanced product data
     enhanced = []
-    for product in products:
-        try:
-            # Calculate compatibility score based on user profile
-            compatibility_factors = []
-            
-            # Age appropriateness
-            age_score = 0.8  # Default high score
-            if user_profile.get('age_group') == '13-17' and 'mature' in product.get('title', '').lower():
-                age_score = 0.3
-            elif user_profile.get('age_group') == '50+' and 'gaming' in product.get('title', '').lower():
-                age_score = 0.5
-            
-            compatibility_factors.append(age_score)
-            
-            # Price appropriateness (closer to middle of budget = higher score)
-            budget = user_profile.get('budget', [20, 100])
-            price = product.get('price', 0)
-            budget_mid = (budget[0] + budget[1]) / 2
-            price_score = 1 - abs(price - budget_mid) / (budget[1] - budget[0])
-            price_score = max(0.2, min(1.0, price_score))
-            
-            compatibility_factors.append(price_score)
-            
-            # Overall compatibility
-            compatibility = np.mean(compatibility_factors) * 100
-            
-            # AI insights based on product and user profile
-            insights = []
-            
-            if product.get('rating', 0) > 4.0:
-                insights.append("⭐ Highly rated by customers")
-            
-            if product.get('review_count', 0) > 100:
-                insights.append("📊 Popular choice with many reviews")
-            
-            if price < budget_mid:
-                insights.append("💰 Great value for money")
-            
-            if 'premium' in product.get('title', '').lower() or price > budget_mid * 1.5:
-                insights.append("✨ Premium quality option")
-            
-            # Enhanced product data
-            enhanced_product = product.copy()
-            enhanced_product.update({
-                'compatibility_score': round(compatibility, 1),
-                'ai_insights': insights,
-                'price_position': 'budget-friendly' if price < budget_mid else 'premium',
-                'recommendation_reason': f"Matches your interest in {user_profile.get('interests', 'gifts').split()[0]}"
-            })
-            
-            enhanced.append(enhanced_product)
-            
-        except Exception as e:
-            logger.error(f"Enhancement error: {e}")
+    for product, ok, score, flags, cheap in zip(
+            products, valid.tolist(), compatibility.tolist(), insight_flags.tolist(), below_mid.tolist()):
+        if not ok:
             enhanced.append(product)
+            continue
+        enhanced.append({
+            **product,
+            'compatibility_score': score,
+            'ai_insights': [insight for insight, flag in zip(AI_INSIGHTS, flags) if flag],
+            'price_position': 'budget-friendly' if cheap else 'premium',
+            'recommendation_reason': reason
+        })
     
     return enhanced
 
+AI_INSIGHTS = (
+    "⭐ Highly rated by customers",
+    "📊 Popular choice with many reviews",
+    "💰 Great value for money",
+    "✨ Premium quality option"
+)
+
+def _numeric_column(products: List[Dict], key: str) -> np.ndarray:
+    """Float column of ``key`` (0 when missing, NaN when not a number)"""
+    values = [product.get(key, 0) for product in products]
+    column = np.array(values)
+    if column.dtype.kind in 'biuf':
+        return column.astype(float)
+    
+    # Mixed types: keep the numbers, mark the rest
+    return np.array([value if isinstance(value, numbers.Real) else np.nan for value in values], dtype=float)
+
+# Local search and insight scoring run in a bounded pool off the event loop;
+# process workers load their own copy of the local database
+scoring_pool = WorkerPool(
+    workers=int(os.getenv('SCORING_WORKERS', '4')),
+    max_queue=int(os.getenv('SCORING_QUEUE', '64')),
+    mode=os.getenv('SCORING_POOL', 'thread'),
+    name='scoring',
+    initializer=load_local_database if os.getenv('SCORING_POOL') == 'process' else None
+)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
@@ -257,7 +289,7 @@ async def startup_event():
         logger.warning("⚠️ Local database not available")
     
     # Check Amazon API status
-    api_status = amazon_api.get_api_status()
+    api_status = get_amazon_api().get_api_status()
     if api_status['api_available']:
         logger.info("✅ Amazon API ready")
     else:
@@ -266,14 +298,15 @@ async def startup_event():
 @app.get("/")
 async def root():
     """API health check"""
-    api_status = amazon_api.get_api_status()
+    api_status = get_amazon_api().get_api_status()
     return {
         "service": "Gift Guru API - Amazon Integrated",
         "status": "healthy",
         "version": "2.0.0",
         "timestamp": datetime.now().isoformat(),
-        "local_database": local_df is not None,
-        "local_products_count": len(local_df) if local_df is not None else 0,
+        "local_database": local_index is not None,
+        "local_products_count": len(local_index) if local_index is not None else 0,
+        "scoring_pool": scoring_pool.stats(),
         **api_status
     }
 
@@ -285,6 +318,7 @@ async def get_recommendations(request: RecommendationRequest):
     try:
         recommendations = []
         data_source = "unknown"
+        data_freshness = None
         
         # User profile for AI enhancement
         user_profile = {
@@ -297,23 +331,28 @@ async def get_recommendations(request: RecommendationRequest):
         }
         
         # Try Amazon API first if enabled and available
-        if request.use_amazon_api and amazon_api.get_api_status()['api_available']:
+        # Only the availability flag: the full status queries the SQLite cache
+        if request.use_amazon_api and get_amazon_api().api_available:
             logger.info("🔍 Searching Amazon products...")
             
-            amazon_products = search_amazon_products(
+            amazon_search = await search_amazon_products(
                 interests=request.interests,
                 age_group=request.age_group,
                 budget=request.budget,
                 max_results=10
             )
+            amazon_products = amazon_search.products
             
             if amazon_products:
+                get_amazon_api().record_served(product.asin for product in amazon_products)
+                
                 # Convert Amazon products to dict format
                 amazon_dicts = [product.to_dict() for product in amazon_products]
-                recommendations = enhance_recommendations_with_ai_insights(
-                    amazon_dicts, user_profile
+                recommendations = await scoring_pool.run(
+                    enhance_recommendations_with_ai_insights, amazon_dicts, user_profile
                 )
                 data_source = "amazon_api"
+                data_freshness = "stale" if amazon_search.stale else "fresh"
                 logger.info(f"✅ Found {len(recommendations)} Amazon products")
             else:
                 logger.warning("No Amazon products found, falling back to local database")
@@ -322,15 +361,13 @@ async def get_recommendations(request: RecommendationRequest):
         if not recommendations:
             logger.info("🔍 Searching local database...")
             
-            local_products = search_local_products(
-                interests=request.interests,
-                budget=request.budget,
-                max_results=10
+            local_products = await scoring_pool.run(
+                search_local_products, request.interests, request.budget, 10
             )
             
             if local_products:
-                recommendations = enhance_recommendations_with_ai_insights(
-                    local_products, user_profile
+                recommendations = await scoring_pool.run(
+                    enhance_recommendations_with_ai_insights, local_products, user_profile
                 )
                 data_source = "local_database"
                 logger.info(f"✅ Found {len(recommendations)} local products")
@@ -351,9 +388,16 @@ async def get_recommendations(request: RecommendationRequest):
             total_found=len(recommendations),
             response_time=round(response_time, 3),
             data_source=data_source,
+            data_freshness=data_freshness,
             malayali_humor=malayali_humor_text
         )
         
+    except PoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many requests in progress, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Recommendation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -386,7 +430,7 @@ async def submit_feedback(feedback: FeedbackRequest):
 @app.get("/amazon-status")
 async def amazon_api_status():
     """Get detailed Amazon API status"""
-    status = amazon_api.get_api_status()
+    status = get_amazon_api().get_api_status()
     
     # Additional diagnostics
     credentials_available = all([
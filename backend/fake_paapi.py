@@ -0,0 +1,184 @@
+"""Offline stand-in for the Product Advertising API client
+
+``FakeAmazonApi`` answers ``search_items`` and ``get_items`` from a seeded
+synthetic catalog with the attribute layout ``_parse_amazon_item`` reads,
+after a configurable latency, and injects throttling errors and timeouts.
+Set ``AMAZON_API_MODE=fake`` to have ``AmazonAPIManager`` use it, e.g.:
+
+    AMAZON_API_MODE=fake FAKE_PAAPI_LATENCY=lognormal:0.3:0.5 FAKE_PAAPI_TPS=1 python enhanced_api.py
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+try:
+    from amazon_paapi.errors import TooManyRequestsException
+except ImportError:
+    class TooManyRequestsException(Exception):
+        """Request rejected for exceeding the account's request rate"""
+
+CATEGORIES = {
+    'Electronics': ['wireless', 'bluetooth', 'smart', 'portable', 'gaming', 'headphones', 'speaker', 'charger'],
+    'Books': ['novel', 'cookbook', 'guide', 'poetry', 'history', 'fantasy', 'mystery', 'journal'],
+    'Sports': ['fitness', 'yoga', 'running', 'cycling', 'outdoor', 'camping', 'hiking', 'gym'],
+    'Home': ['kitchen', 'coffee', 'candle', 'blanket', 'decor', 'plant', 'tea', 'mug'],
+    'Toys': ['puzzle', 'lego', 'board', 'game', 'craft', 'science', 'kit', 'plush'],
+    'Beauty': ['skincare', 'perfume', 'spa', 'makeup', 'grooming', 'wellness', 'bath', 'aroma'],
+    'Fashion': ['watch', 'wallet', 'scarf', 'jewelry', 'sunglasses', 'bag', 'leather', 'premium']
+}
+BRANDS = ['Acme', 'Nimbus', 'Orchid', 'Vertex', 'Kerala Crafts', 'Lumen', 'Summit', 'Tusker']
+COLORS = ['Black', 'White', 'Blue', 'Red', 'Green', 'Silver', 'Brown']
+AVAILABILITY = ['In Stock', 'In Stock', 'In Stock', 'Only 3 left in stock', 'Temporarily out of stock']
+# PA-API GetItems accepts at most 10 ASINs per call
+MAX_ITEMS_PER_CALL = 10
+
+
+class FakeAmazonApi:
+    """Drop-in for ``amazon_paapi.AmazonApi`` backed by a synthetic catalog
+
+    ``latency`` is a ``distribution:params`` spec (see ``latency_sampler``).
+    Calls beyond ``tps`` per second (0 disables the limit) or picked with
+    probability ``throttle_rate`` raise ``TooManyRequestsException``; calls
+    picked with probability ``timeout_rate`` hang for ``timeout`` seconds
+    and raise ``TimeoutError``.
+    """
+
+    def __init__(self, catalog_size=5000, seed=42, latency='fixed:0', tps=0.0,
+                 throttle_rate=0.0, timeout_rate=0.0, timeout=10.0):
+        self.rng = np.random.default_rng(seed)
+        self.items = _build_catalog(catalog_size, self.rng)
+        self.by_asin = {item.asin: item for item in self.items}
+        self._terms = [_item_terms(item) for item in self.items]
+        self._prices = np.array([item.offers.listings[0].price.amount for item in self.items])
+        self.sample_latency = latency_sampler(latency, self.rng)
+        self.tps = tps
+        self.throttle_rate = throttle_rate
+        self.timeout_rate = timeout_rate
+        self.timeout = timeout
+        self._last_call = float('-inf')
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            catalog_size=int(os.getenv('FAKE_PAAPI_CATALOG_SIZE', '5000')),
+            seed=int(os.getenv('FAKE_PAAPI_SEED', '42')),
+            latency=os.getenv('FAKE_PAAPI_LATENCY', 'lognormal:0.25:0.4'),
+            tps=float(os.getenv('FAKE_PAAPI_TPS', '1')),
+            throttle_rate=float(os.getenv('FAKE_PAAPI_THROTTLE_RATE', '0')),
+            timeout_rate=float(os.getenv('FAKE_PAAPI_TIMEOUT_RATE', '0')),
+            timeout=float(os.getenv('FAKE_PAAPI_TIMEOUT', '10'))
+        )
+
+    def search_items(self, keywords, item_count=10, min_price=None, max_price=None, **kwargs):
+        """Items whose title or category shares a word with ``keywords``, best match first"""
+        self._call()
+        words = set(keywords.lower().split())
+        matches = np.array([len(words & terms) for terms in self._terms])
+        if min_price:
+            matches[self._prices < min_price] = 0
+        if max_price:
+            matches[self._prices > max_price] = 0
+
+        candidates = np.flatnonzero(matches)
+        order = candidates[np.argsort(-matches[candidates], kind='stable')][:min(item_count, 10)]
+        return SimpleNamespace(items=[self.items[i] for i in order])
+
+    def get_items(self, items, **kwargs):
+        self._call()
+        if len(items) > MAX_ITEMS_PER_CALL:
+            raise ValueError(f"At most {MAX_ITEMS_PER_CALL} items per request")
+        return [self.by_asin[asin] for asin in items if asin in self.by_asin]
+
+    def stats(self):
+        return {
+            'calls': self.calls,
+            'throttled': self.throttled,
+            'timeouts': self.timeouts,
+            'catalog_size': len(self.items)
+        }
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            throttled = (self.tps and now - self._last_call < 1 / self.tps) \
+                or self.rng.random() < self.throttle_rate
+            if not throttled:
+                self._last_call = now
+            timed_out = not throttled and self.rng.random() < self.timeout_rate
+            delay = self.sample_latency()
+
+        if throttled:
+            with self._lock:
+                self.throttled += 1
+            raise TooManyRequestsException("Requests limit reached, try increasing throttling or wait")
+        if timed_out:
+            time.sleep(self.timeout)
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Request timed out after {self.timeout}s")
+        time.sleep(delay)
+
+
+def latency_sampler(spec, rng):
+    """Parse a latency spec into a function returning seconds
+
+    ``fixed:S``, ``uniform:LOW:HIGH``, ``exponential:MEAN`` or
+    ``lognormal:MEDIAN:SIGMA``.
+    """
+    name, *params = spec.split(':')
+    params = [float(p) for p in params]
+    if name == 'fixed':
+        return lambda: params[0]
+    if name == 'uniform':
+        return lambda: rng.uniform(params[0], params[1])
+    if name == 'exponential':
+        return lambda: rng.exponential(params[0])
+    if name == 'lognormal':
+        return lambda: params[0] * np.exp(rng.normal(0, params[1]))
+    raise ValueError(f"Unknown latency distribution '{name}'")
+
+
+def _build_catalog(size, rng):
+    names = list(CATEGORIES)
+    items = []
+    for i in range(size):
+        category = names[rng.integers(len(names))]
+        words = rng.choice(CATEGORIES[category], 3, replace=False)
+        price_cents = int(rng.lognormal(np.log(3000), 0.8))
+        stars = round(float(rng.uniform(3, 5)), 1)
+        items.append(SimpleNamespace(
+            asin=f"B{i:09d}",
+            detail_page_url=f"https://www.amazon.com/dp/B{i:09d}?tag=fake-20",
+            item_info=SimpleNamespace(
+                title=SimpleNamespace(display_value=f"{' '.join(words).title()} {category} Gift"),
+                by_line_info=SimpleNamespace(brand={'display_value': BRANDS[rng.integers(len(BRANDS))]}),
+                product_info=SimpleNamespace(color={'display_value': COLORS[rng.integers(len(COLORS))]}),
+                classifications=SimpleNamespace(product_group=SimpleNamespace(display_value=category))
+            ),
+            offers=SimpleNamespace(listings=[SimpleNamespace(
+                price=SimpleNamespace(amount=price_cents, currency='USD'),
+                availability=SimpleNamespace(message=AVAILABILITY[rng.integers(len(AVAILABILITY))])
+            )]),
+            images=SimpleNamespace(primary=SimpleNamespace(
+                large=SimpleNamespace(url=f"https://m.media-amazon.com/images/I/fake{i}.jpg")
+            )),
+            customer_reviews=SimpleNamespace(
+                star_rating=SimpleNamespace(value=f"{stars} out of 5 stars"),
+                count=SimpleNamespace(value=int(rng.integers(0, 20000)))
+            )
+        ))
+    return items
+
+
+def _item_terms(item):
+    title = item.item_info.title.display_value.lower()
+    return set(title.split()) | {item.item_info.classifications.product_group.display_value.lower()}
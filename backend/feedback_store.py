@@ -0,0 +1,129 @@
+"""Append-only feedback storage for Gift Guru"""
+
+import csv
+import io
+import os
+import threading
+from typing import Any, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process advisory locks
+    fcntl = None
+
+# Column layout of user_feedback.csv (read by analytics.load_feedback_data)
+FEEDBACK_COLUMNS = [
+    'timestamp',
+    'age_range',
+    'gender',
+    'interests',
+    'occasion',
+    'budget',
+    'recommendations',
+    'ratings',
+    'average_rating'
+]
+
+
+class FeedbackWriter:
+    """Appends feedback rows to a CSV file in constant time.
+
+    Each row is written with a single ``write`` on an ``O_APPEND`` descriptor
+    while holding an exclusive ``flock``, so concurrent uvicorn workers and
+    Streamlit sessions never interleave or drop rows. Durability uses group
+    commit: threads that append while an ``fsync`` is in flight share the
+    next one instead of each paying for their own.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._write_lock = threading.Lock()
+        self._commit = threading.Condition()
+        self._written = 0  # rows appended by this process
+        self._synced = 0   # rows known to be on disk
+        self._syncing = False
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Append one feedback row, returning once it is durable"""
+        line = self._format_row(row)
+
+        with self._write_lock:
+            self._lock_file()
+            try:
+                # Another process may have created the file since we opened it
+                if os.fstat(self._fd).st_size == 0:
+                    line = self._format_row(dict(zip(FEEDBACK_COLUMNS, FEEDBACK_COLUMNS))) + line
+                os.write(self._fd, line.encode('utf-8'))
+            finally:
+                self._unlock_file()
+            self._written += 1
+            sequence = self._written
+
+        if self.fsync:
+            self._wait_for_commit(sequence)
+
+    def close(self) -> None:
+        """Flush pending rows and close the file"""
+        with self._write_lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    def _wait_for_commit(self, sequence: int) -> None:
+        """Block until row ``sequence`` has been fsynced (group commit)"""
+        with self._commit:
+            while self._synced < sequence:
+                if self._syncing:
+                    # A leader is already syncing; its fsync may cover us
+                    self._commit.wait()
+                    continue
+
+                # Become the leader: one fsync covers everything written so far
+                self._syncing = True
+                target = self._written
+                self._commit.release()
+                try:
+                    os.fsync(self._fd)
+                finally:
+                    self._commit.acquire()
+                    self._syncing = False
+                self._synced = max(self._synced, target)
+                self._commit.notify_all()
+
+    def _lock_file(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock_file(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _format_row(row: Dict[str, Any]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(
+            [row.get(column, '') for column in FEEDBACK_COLUMNS]
+        )
+        return buffer.getvalue()
+
+
+def build_feedback_row(timestamp: str,
+                       user_data: Dict[str, Any],
+                       recommendations: List[Dict[str, Any]],
+                       ratings: List[int]) -> Dict[str, Any]:
+    """Build a feedback row in the user_feedback.csv column layout"""
+    rated = [r for r in ratings if r > 0]
+    return {
+        'timestamp': timestamp,
+        'age_range': user_data.get('age_range', ''),
+        'gender': user_data.get('gender', ''),
+        'interests': user_data.get('interests', ''),
+        'occasion': user_data.get('occasion', ''),
+        'budget': f"${user_data.get('budget_min', 0)}-${user_data.get('budget_max', 0)}",
+        'recommendations': str([r['name'] for r in recommendations]),
+        'ratings': str(ratings),
+        'average_rating': sum(rated) / len(rated) if rated else 0
+    }
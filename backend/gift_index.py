@@ -0,0 +1,216 @@
+"""Price-ordered gift index for fast budget filtering"""
+
+import numpy as np
+
+# How far past budget_max to look when nothing fits the budget
+BUDGET_EXPANSION = 20
+
+# Prices are stored as float32; values read back are rounded to cents
+PRICE_DECIMALS = 2
+
+
+class GiftIndex:
+    """Gift vectors permuted into ascending price order.
+
+    Any budget range maps to a contiguous block of positions, located with
+    two binary searches over the sorted prices. Vectors are kept
+    feature-major (one row of price-ordered postings per term), so scoring a
+    budget block reads only the postings of the profile's terms that fall
+    inside it, without slicing or copying the gift matrix.
+    """
+
+    def __init__(self, prices, gift_vectors, columns=None):
+        prices = np.asarray(prices, dtype=np.float64)
+
+        # order[i] is the catalog row stored at price position i
+        self.order = np.argsort(prices, kind='stable')
+        self.prices = prices[self.order].astype(np.float32)
+
+        # Catalog fields pre-extracted in price order, e.g. columns['product_name'][position]
+        self.columns = {
+            field: np.asarray(values, dtype=object)[self.order].tolist()
+            for field, values in (columns or {}).items()
+        }
+
+        # postings[term] lists (price position, weight) pairs sorted by position
+        self.postings = gift_vectors[self.order].T.tocsr()
+        self.postings.sort_indices()
+        self.term_max_weights = _row_max(self.postings)
+
+    @classmethod
+    def from_arrays(cls, order, prices, postings, columns, term_max_weights=None):
+        """Rebuild an index from arrays previously taken from an instance"""
+        index = cls.__new__(cls)
+        index.order = order
+        index.prices = prices
+        index.postings = postings
+        index.columns = columns
+        index.term_max_weights = _row_max(postings) if term_max_weights is None else term_max_weights
+        return index
+
+    def __len__(self):
+        return len(self.prices)
+
+    def record(self, position):
+        """All catalog fields of the gift at ``position`` as a plain dict"""
+        record = {}
+        for field, column in self.columns.items():
+            value = column[position]
+            record[field] = value.item() if isinstance(value, np.generic) else value
+        return record
+
+    def budget_range(self, budget_min, budget_max):
+        """Return the (start, end) positions of gifts within budget
+
+        If nothing fits, the range is expanded to everything priced up to
+        ``budget_max + BUDGET_EXPANSION``. An empty range means no gifts.
+        """
+        start, end = self.price_range(budget_min, budget_max)
+        if start == end:
+            start, end = self.price_range(-np.inf, budget_max + BUDGET_EXPANSION)
+        return start, end
+
+    def price_range(self, low, high):
+        """Return the (start, end) positions of gifts priced in [low, high]"""
+        # Bounds are cast to the price dtype so searchsorted neither converts
+        # the whole array nor disagrees with the stored (rounded) prices
+        start = int(np.searchsorted(self.prices, self.prices.dtype.type(low), side='left'))
+        end = int(np.searchsorted(self.prices, self.prices.dtype.type(high), side='right'))
+        return start, max(start, end)
+
+    def score_between(self, user_vector, start, end):
+        """Similarity of one vectorized profile to the gifts at positions [start, end)
+
+        TF-IDF rows are L2-normalized, so the dot product is the cosine similarity.
+        """
+        scores = np.zeros(end - start)
+        indptr, positions, weights = self.postings.indptr, self.postings.indices, self.postings.data
+
+        for term, query_weight in zip(user_vector.indices, user_vector.data):
+            first, last = indptr[term], indptr[term + 1]
+            term_positions = positions[first:last]
+            lo = first + np.searchsorted(term_positions, start)
+            hi = first + np.searchsorted(term_positions, end)
+            scores[positions[lo:hi] - start] += query_weight * weights[lo:hi]
+
+        return scores
+
+    def top_k_between(self, user_vector, start, end, k):
+        """Positions and scores of the ``k`` best gifts in [start, end), best first
+
+        Returns the ranking of ``top_k(score_between(...), k)`` using MaxScore
+        pruning, with ties going to the cheaper gift in both. Scores are
+        summed in a different term order, though, so gifts whose scores tie
+        exactly in theory can differ in the last bits and swap places.
+
+        Each query term has an upper bound on what it can add to any gift
+        (query weight x its largest posting weight). Terms are visited
+        shortest postings first; once the bounds of the unvisited terms add
+        up to less than the current k-th best score, no gift seen so far can
+        be overtaken by an unseen one, so the remaining (usually long,
+        common-word) postings are only probed for existing candidates and
+        hopeless candidates are dropped. Nothing scans the budget block.
+        """
+        if k <= 0 or start >= end:
+            return np.array([], dtype=np.intp), np.array([])
+
+        indptr, all_positions, all_weights = self.postings.indptr, self.postings.indices, self.postings.data
+        terms, query_weights = user_vector.indices, user_vector.data
+
+        # Each term's postings inside the budget block
+        firsts, lasts = indptr[terms], indptr[terms + 1]
+        los = np.array([first + np.searchsorted(all_positions[first:last], start)
+                        for first, last in zip(firsts, lasts)], dtype=np.int64)
+        his = np.array([first + np.searchsorted(all_positions[first:last], end)
+                        for first, last in zip(firsts, lasts)], dtype=np.int64)
+
+        visit = np.argsort(his - los, kind='stable')
+        bounds = (query_weights * self.term_max_weights[terms])[visit]
+        # remaining[i] bounds what the i-th visited term onwards can still add
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1], 0.0)
+
+        candidates = np.array([], dtype=all_positions.dtype)
+        scores = np.array([])
+        threshold = 0.0
+        for i, slot in enumerate(visit.tolist()):
+            positions = all_positions[los[slot]:his[slot]]
+            weights = all_weights[los[slot]:his[slot]]
+
+            if len(candidates) < k or remaining[i] >= threshold:
+                # Essential term: any of its gifts may still reach the top k
+                candidates, inverse = np.unique(np.concatenate([candidates, positions]), return_inverse=True)
+                scores = np.bincount(
+                    inverse, weights=np.concatenate([scores, query_weights[slot] * weights])
+                )
+            elif len(positions):
+                # Non-essential term: only probe it for gifts that are already candidates
+                found = np.minimum(np.searchsorted(positions, candidates), len(positions) - 1)
+                hits = positions[found] == candidates
+                scores[hits] += query_weights[slot] * weights[found[hits]]
+
+            if len(candidates) >= k:
+                threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+                keep = scores + remaining[i + 1] >= threshold
+                candidates, scores = candidates[keep], scores[keep]
+
+        winners = top_k(scores, k)
+        positions, winner_scores = candidates[winners].astype(np.intp), scores[winners]
+
+        if len(positions) < k:
+            # Pad with unmatched (zero score) gifts, cheapest first like top_k
+            window = np.arange(start, min(end, start + k + len(candidates)))
+            padding = window[~np.isin(window, candidates)][:k - len(positions)]
+            positions = np.concatenate([positions, padding])
+            winner_scores = np.concatenate([winner_scores, np.zeros(len(padding))])
+
+        return positions, winner_scores
+
+
+class PriceColumn:
+    """Catalog price column read from an index's float32 ``prices``"""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __getitem__(self, position):
+        return round(float(self.prices[position]), PRICE_DECIMALS)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+def top_k(scores, k):
+    """Indices of the ``k`` highest scores, best first
+
+    Same result as ``np.argsort(-scores, kind='stable')[:k]``: ties, also
+    those at the k-th place, go to the lower index (cheapest first in a
+    price-ordered block). Uses a partial selection so only the winners are
+    sorted.
+    """
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    if k >= len(scores):
+        winners = np.arange(len(scores))
+    else:
+        # Selecting the k smallest negated scores stays fast even when most
+        # scores are tied at zero, unlike selecting from the top end
+        negated = -scores
+        kth = np.partition(negated, k - 1)[k - 1]
+        above = np.flatnonzero(negated < kth)
+        # Which of the gifts tied with the k-th make the cut is up to us, not the partition
+        tied = np.flatnonzero(negated == kth)[:k - len(above)]
+        winners = np.sort(np.concatenate([above, tied]))
+    return winners[np.argsort(-scores[winners], kind='stable')]
+
+
+def _row_max(matrix):
+    """Largest stored value in each row of a CSR matrix (0 for empty rows)"""
+    maxima = np.zeros(matrix.shape[0])
+    nonempty = np.diff(matrix.indptr) > 0
+    if matrix.nnz:
+        maxima[nonempty] = np.maximum.reduceat(matrix.data, matrix.indptr[:-1][nonempty])
+    return maxima
@@ -0,0 +1,19 @@
+"""Gunicorn settings for serving api.py from several worker processes
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py api:app
+
+The app is imported once in the master and the workers are forked from it,
+so they share the memory-mapped index bundle and everything loaded before
+the fork instead of each building their own. With STARTUP_MODE=lazy each
+worker loads the index after the fork instead; the bundle's pages are still
+shared through the page cache.
+"""
+
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+timeout = int(os.getenv('WORKER_TIMEOUT', '60'))
@@ -0,0 +1,354 @@
+"""Incremental gift indexing without refitting the vectorizer
+
+Products are featurized with a fixed-size HashingVectorizer, so adding one
+never changes the feature space, and document frequencies are tracked
+online as products come and go. A product added through the API is
+appended to an unmerged "delta" segment in O(row) time, weighted with the
+IDF of the current main segment. Once enough changes pile up, a background
+merge re-weights everything with fresh IDF into a new price-ordered
+GiftIndex and swaps it in.
+
+Products added or removed through the API live in memory only; they are
+not written back to gift_database.csv.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, NamedTuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from gift_index import BUDGET_EXPANSION, GiftIndex, top_k
+from index_bundle import INDEX_CONFIGS, catalog_hash
+
+N_FEATURES = 2 ** 18
+
+# Unmerged adds/removes that trigger a background IDF re-weight
+MERGE_THRESHOLD = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Product(NamedTuple):
+    price: float
+    record: Dict[str, Any]
+    indices: np.ndarray  # hashed feature ids
+    counts: np.ndarray   # raw term counts
+    sequence: int        # change number that added it
+
+
+class HashedTfidfVectorizer:
+    """Hashing features weighted by a fixed IDF vector, L2-normalized"""
+
+    def __init__(self, hasher, idf):
+        self.hasher = hasher
+        self.idf = idf
+
+    def transform(self, texts):
+        counts = self.hasher.transform(texts)
+        return self.weight(counts)
+
+    def weight(self, counts):
+        # Scale each stored count by its term's IDF; multiplying by a
+        # 2**18-square diagonal matrix would cost milliseconds per call.
+        # Copied because Product entries share the raw count arrays
+        weighted = sp.csr_matrix(counts, dtype=np.float64, copy=True)
+        weighted.data *= self.idf[weighted.indices]
+        return normalize(weighted, copy=False)
+
+
+class DeltaSegment:
+    """Rows added since the last merge, stored in growable flat buffers
+
+    Writers only ever append, so a reader that captured ``count`` and
+    ``nnz`` keeps seeing a consistent prefix while new rows arrive.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.nnz = 0
+        self.prices = np.empty(capacity)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.live = np.ones(capacity, dtype=bool)
+        self.records = []
+        self.rows = np.empty(capacity * 8, dtype=np.int64)
+        self.indices = np.empty(capacity * 8, dtype=np.int32)
+        self.data = np.empty(capacity * 8)
+
+    def append(self, product_id, price, record, weighted_row):
+        """Append one weighted 1 x N_FEATURES row in amortized O(row) time"""
+        row_nnz = weighted_row.nnz
+        if self.count == len(self.prices):
+            self.prices, self.ids, self.live = (
+                _grow(self.prices), _grow(self.ids), _grow(self.live, fill=True)
+            )
+        while self.nnz + row_nnz > len(self.data):
+            self.rows, self.indices, self.data = _grow(self.rows), _grow(self.indices), _grow(self.data)
+
+        self.rows[self.nnz:self.nnz + row_nnz] = self.count
+        self.indices[self.nnz:self.nnz + row_nnz] = weighted_row.indices
+        self.data[self.nnz:self.nnz + row_nnz] = weighted_row.data
+        self.prices[self.count] = price
+        self.ids[self.count] = product_id
+        self.records.append(record)
+
+        # Publish the row only after its data is in place
+        self.nnz += row_nnz
+        self.count += 1
+        return self.count - 1
+
+    def scores(self, query, count, nnz):
+        """Similarity of ``query`` to each of the first ``count`` rows"""
+        if query.nnz == 0 or count == 0:
+            return np.zeros(count)
+
+        order = np.argsort(query.indices)
+        query_indices, query_weights = query.indices[order], query.data[order]
+
+        indices = self.indices[:nnz]
+        matches = np.minimum(np.searchsorted(query_indices, indices), len(query_indices) - 1)
+        hits = query_indices[matches] == indices
+        contributions = np.where(hits, self.data[:nnz] * query_weights[matches], 0.0)
+        return np.bincount(self.rows[:nnz], weights=contributions, minlength=count)
+
+
+class IncrementalSnapshot(NamedTuple):
+    """Immutable view of the incremental index used by one request"""
+    vectorizer: HashedTfidfVectorizer
+    index: GiftIndex        # merged, price-ordered main segment
+    main_ids: np.ndarray    # product id at each main position
+    main_live: np.ndarray   # False once a main product is removed
+    delta: DeltaSegment
+    delta_count: int
+    delta_nnz: int
+    content_hash: str
+
+    def search(self, user_profile, budget_min, budget_max, num_recommendations):
+        """Top (record, score) pairs across the main and delta segments"""
+        user_vector = self.vectorizer.transform([user_profile])
+
+        start, end, delta_rows = self._budget_candidates(budget_min, budget_max)
+        if start == end and delta_rows.size == 0:
+            # If no gifts in budget, expand the range
+            start, end, delta_rows = self._budget_candidates(-np.inf, budget_max + BUDGET_EXPANSION)
+
+        main_scores = self.index.score_between(user_vector, start, end)
+        main_scores[~self.main_live[start:end]] = -np.inf
+        delta_scores = self.delta.scores(user_vector, self.delta_count, self.delta_nnz)[delta_rows]
+
+        similarity_scores = np.concatenate([main_scores, delta_scores])
+        results = []
+        for idx in top_k(similarity_scores, num_recommendations).tolist():
+            score = similarity_scores[idx]
+            if score == -np.inf:
+                break
+            if idx < end - start:
+                record = self.index.record(start + idx)
+            else:
+                record = self.delta.records[delta_rows[idx - (end - start)]]
+            results.append((record, float(score)))
+        return results
+
+    def _budget_candidates(self, low, high):
+        start, end = self.index.price_range(low, high)
+        if not self.main_live[start:end].any():
+            start = end
+        prices = self.delta.prices[:self.delta_count]
+        live = self.delta.live[:self.delta_count]
+        delta_rows = np.flatnonzero((prices >= low) & (prices <= high) & live)
+        return start, end, delta_rows
+
+
+class IncrementalGiftIndex:
+    """Gift index that supports adding and removing products online"""
+
+    def __init__(self, csv_path, name='recommender'):
+        config = INDEX_CONFIGS[name]
+        self.text_fields = config['text_fields']
+        vectorizer_params = {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in config['vectorizer'].items()
+            if key != 'max_features'
+        }
+        self.hasher = HashingVectorizer(
+            n_features=N_FEATURES, alternate_sign=False, norm=None, **vectorizer_params
+        )
+
+        self._lock = threading.Lock()
+        self._merging = threading.Lock()
+        self._products: Dict[int, Product] = {}
+        self._locations = {}  # product id -> ('main' | 'delta', position)
+        self._document_frequency = np.zeros(N_FEATURES, dtype=np.int64)
+        self._sequence = 0
+        self._changes = 0
+        self._base_hash = catalog_hash(csv_path)
+
+        gifts_df = pd.read_csv(csv_path)
+        counts = self.hasher.transform(self._features(gifts_df)).tocsr()
+        records = gifts_df.to_dict('records')
+        for row, record in enumerate(records):
+            first, last = counts.indptr[row], counts.indptr[row + 1]
+            self._products[row] = Product(
+                float(record['price']), record,
+                counts.indices[first:last], counts.data[first:last], 0
+            )
+        self._document_frequency += np.bincount(counts.indices, minlength=N_FEATURES)
+        self._next_id = len(records)
+
+        self.snapshot = self._build_snapshot(dict(self._products), self._document_frequency.copy())
+        self._locate_main(self.snapshot)
+
+    def __len__(self):
+        return len(self._products)
+
+    def add_product(self, record):
+        """Index a new product (a gift_database.csv row as a dict); returns its id"""
+        counts = self.hasher.transform([self._record_features(record)]).tocsr()
+
+        with self._lock:
+            self._sequence += 1
+            product_id = self._next_id
+            self._next_id += 1
+            product = Product(float(record['price']), dict(record), counts.indices, counts.data, self._sequence)
+            self._products[product_id] = product
+            self._document_frequency[counts.indices] += 1
+
+            snapshot = self.snapshot
+            position = snapshot.delta.append(
+                product_id, product.price, product.record, snapshot.vectorizer.weight(counts)
+            )
+            self._locations[product_id] = ('delta', position)
+            self._publish(snapshot)
+
+        self._maybe_merge()
+        return product_id
+
+    def remove_product(self, product_id):
+        """Remove a product; returns False if the id is unknown"""
+        with self._lock:
+            product = self._products.pop(product_id, None)
+            if product is None:
+                return False
+            self._sequence += 1
+            self._document_frequency[product.indices] -= 1
+
+            snapshot = self.snapshot
+            segment, position = self._locations.pop(product_id)
+            if segment == 'main':
+                snapshot.main_live[position] = False
+            else:
+                snapshot.delta.live[position] = False
+            self._publish(snapshot)
+
+        self._maybe_merge()
+        return True
+
+    def merge(self):
+        """Re-weight all products with fresh IDF into a new main segment"""
+        with self._merging:
+            with self._lock:
+                cutoff = self._sequence
+                products = dict(self._products)
+                document_frequency = self._document_frequency.copy()
+
+            # The expensive rebuild runs without blocking writers
+            merged = self._build_snapshot(products, document_frequency)
+
+            with self._lock:
+                self._locate_main(merged)
+
+                # Carry over changes that raced with the rebuild
+                for position, product_id in enumerate(merged.main_ids.tolist()):
+                    if product_id not in self._products:
+                        merged.main_live[position] = False
+                        del self._locations[product_id]
+                for product_id, product in self._products.items():
+                    if product.sequence > cutoff:
+                        counts = sp.csr_matrix(
+                            (product.counts, product.indices, [0, len(product.indices)]),
+                            shape=(1, N_FEATURES)
+                        )
+                        position = merged.delta.append(
+                            product_id, product.price, product.record, merged.vectorizer.weight(counts)
+                        )
+                        self._locations[product_id] = ('delta', position)
+                self._publish(merged)
+                self._changes = merged.delta.count
+
+            logger.info(f"Merged incremental index: {len(products)} products")
+
+    def _maybe_merge(self):
+        if self._changes >= MERGE_THRESHOLD and not self._merging.locked():
+            threading.Thread(target=self.merge, name="index-merge", daemon=True).start()
+
+    def _publish(self, snapshot):
+        """Swap in a snapshot reflecting the latest change (caller holds the lock)"""
+        self._changes += 1
+        self.snapshot = snapshot._replace(
+            delta_count=snapshot.delta.count,
+            delta_nnz=snapshot.delta.nnz,
+            content_hash=self._version()
+        )
+
+    def _version(self):
+        return hashlib.sha1(f'{self._base_hash}:{self._sequence}'.encode()).hexdigest()
+
+    def _locate_main(self, snapshot):
+        for position, product_id in enumerate(snapshot.main_ids.tolist()):
+            self._locations[product_id] = ('main', position)
+
+    def _build_snapshot(self, products, document_frequency):
+        ids = list(products)
+        entries = [products[product_id] for product_id in ids]
+
+        counts = sp.csr_matrix(
+            (np.concatenate([p.counts for p in entries]) if entries else np.empty(0),
+             np.concatenate([p.indices for p in entries]) if entries else np.empty(0, dtype=np.int32),
+             np.concatenate([[0], np.cumsum([len(p.indices) for p in entries])])),
+            shape=(len(entries), N_FEATURES)
+        )
+
+        # Smoothed IDF, as computed by TfidfVectorizer
+        idf = np.log((1 + len(entries)) / (1 + document_frequency)) + 1
+        vectorizer = HashedTfidfVectorizer(self.hasher, idf)
+
+        records = pd.DataFrame([p.record for p in entries])
+        index = GiftIndex(
+            [p.price for p in entries],
+            vectorizer.weight(counts),
+            columns={column: records[column] for column in records.columns}
+        )
+        return IncrementalSnapshot(
+            vectorizer=vectorizer,
+            index=index,
+            main_ids=np.asarray(ids, dtype=np.int64)[index.order],
+            main_live=np.ones(len(entries), dtype=bool),
+            delta=DeltaSegment(),
+            delta_count=0,
+            delta_nnz=0,
+            content_hash=self._version()
+        )
+
+    def _features(self, gifts_df):
+        features = gifts_df[self.text_fields[0]].fillna('')
+        for field in self.text_fields[1:]:
+            features = features + ' ' + gifts_df[field].fillna('')
+        return features
+
+    def _record_features(self, record):
+        # One row of _features without building a DataFrame
+        values = (record.get(field) for field in self.text_fields)
+        return ' '.join('' if pd.isna(value) else str(value) for value in values)
+
+
+def _grow(array, fill=None):
+    grown = np.empty(len(array) * 2, dtype=array.dtype)
+    grown[:len(array)] = array
+    if fill is not None:
+        grown[len(array):] = fill
+    return grown
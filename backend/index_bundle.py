@@ -0,0 +1,454 @@
+"""Prebuilt gift index bundles for fast backend startup
+
+A bundle is a directory of raw ``.npy`` arrays plus ``meta.json`` written
+next to the catalog CSV (``gift_database.csv`` -> ``gift_database.<name>.index``).
+It holds the fitted vocabulary and IDF weights, the price-ordered CSR
+postings, every catalog column in compact columnar form (float32 prices,
+text as ids into one interned string table) and a SHA-256 of the CSV it was
+built from. Loading a bundle skips CSV parsing and TfidfVectorizer
+fitting entirely; it is rebuilt only when the CSV content (or the index
+configuration) changes.
+
+Arrays are memory-mapped read-only, so every worker process serving the
+same bundle shares one copy of it in the page cache. The bundle path is a
+symlink to a versioned directory and is swapped atomically on rebuild;
+workers still mapping the previous version keep reading it undisturbed.
+Rebuilds take an flock on ``<bundle>.lock``, so when several workers find
+the same bundle stale only the first one refits it.
+
+Usage:
+    python index_bundle.py build-index [CSV ...]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from dense_index import DenseIndex
+from gift_index import GiftIndex, PriceColumn
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process advisory locks
+    fcntl = None
+
+# Bump whenever the on-disk layout changes; older bundles are rebuilt
+BUNDLE_VERSION = 3
+
+# Superseded bundle versions are deleted once this old (seconds), leaving
+# time for workers that resolved the previous symlink to map it
+STALE_BUNDLE_AGE = 300
+
+# Catalog locations tried when no CSV is given (backend/ or project root cwd)
+CATALOG_CANDIDATES = ['../gift_database.csv', 'gift_database.csv']
+
+INDEX_CONFIGS = {
+    # GiftRecommender in api.py
+    'recommender': {
+        'text_fields': ['category', 'tags', 'description'],
+        'vectorizer': {'stop_words': 'english', 'ngram_range': [1, 2], 'max_features': 1000}
+    },
+    # Local fallback search in enhanced_api.py
+    'local': {
+        'text_fields': ['tags'],
+        'vectorizer': {'stop_words': 'english', 'max_features': 1000}
+    }
+}
+
+logger = logging.getLogger(__name__)
+
+
+class IndexBundle(NamedTuple):
+    """A fitted vectorizer with the index it produced"""
+    vectorizer: TfidfVectorizer
+    index: GiftIndex
+    content_hash: str
+    # Optional latent-semantic index derived from ``index`` at load time
+    dense: Optional[DenseIndex] = None
+
+
+class StringColumn:
+    """Read-only column of strings stored as one UTF-8 buffer plus offsets
+
+    Values are decoded on access, so loading a column costs nothing no
+    matter how many rows it has.
+    """
+
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_values(cls, values):
+        encoded = [('' if pd.isna(value) else str(value)).encode('utf-8') for value in values]
+        lengths = np.array([len(value) for value in encoded], dtype=np.int64)
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32 if lengths.sum() < 2 ** 32 else np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        if not -len(self) <= position < len(self):
+            raise IndexError(position)
+        position %= len(self)
+        return self.buffer[self.offsets[position]:self.offsets[position + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+class EncodedColumn:
+    """Read-only column of strings stored as ids into a shared ``StringColumn``
+
+    Ids use the smallest unsigned integer type that fits, so a column with
+    a handful of distinct values (e.g. categories) costs one byte per row.
+    """
+
+    def __init__(self, ids, strings):
+        self.ids = ids
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        return self.strings[int(self.ids[position])]
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def distinct(self):
+        """Distinct values in order of first appearance"""
+        ids, first = np.unique(self.ids, return_index=True)
+        return [self.strings[int(i)] for i in ids[np.argsort(first)]]
+
+
+def find_catalog():
+    """Return the first gift database CSV that exists"""
+    for path in CATALOG_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError('gift_database.csv not found')
+
+
+def bundle_path(csv_path, name):
+    return f'{os.path.splitext(csv_path)[0]}.{name}.index'
+
+
+def catalog_hash(csv_path):
+    """SHA-256 of the catalog file contents"""
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_index(csv_path, name):
+    """Load the named index bundle for ``csv_path``, rebuilding it if stale"""
+    bundle = _load_current(csv_path, name)
+    if bundle is not None:
+        return bundle
+
+    with rebuild_lock(csv_path, name):
+        # Another process may have rebuilt it while we waited for the lock
+        bundle = _load_current(csv_path, name, log_stale=False)
+        if bundle is not None:
+            return bundle
+        return build_index(csv_path, name)
+
+
+@contextmanager
+def rebuild_lock(csv_path, name):
+    """Hold the cross-process lock for rebuilding the named bundle
+
+    Blocks while another process (or thread) holds it. Callers should check
+    ``bundle_is_current`` again once they have it.
+    """
+    try:
+        lock_file = open(f'{bundle_path(csv_path, name)}.lock', 'a')
+    except OSError as e:
+        # Read-only catalog directory: the bundle cannot be written either
+        logger.warning(f"Rebuilding {name} index without a lock: {e}")
+        lock_file = None
+    if lock_file is None:
+        yield
+        return
+
+    with lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_current(csv_path, name, log_stale=True):
+    """The named bundle if it exists and matches the catalog, else None"""
+    path = bundle_path(csv_path, name)
+    if os.path.exists(path):
+        try:
+            bundle = _read_bundle(path, csv_path, INDEX_CONFIGS[name])
+            if bundle is not None:
+                logger.info(f"Loaded index bundle {path} ({len(bundle.index)} gifts)")
+                return bundle
+            if log_stale:
+                logger.info(f"Index bundle {path} is stale, rebuilding")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable index bundle {path}: {e}")
+    return None
+
+
+def build_index(csv_path, name, save=True):
+    """Fit the named index from ``csv_path`` and (optionally) write its bundle"""
+    config = INDEX_CONFIGS[name]
+    stat = os.stat(csv_path)
+    content_hash = catalog_hash(csv_path)
+    gifts_df = pd.read_csv(csv_path)
+
+    # Text the vectorizer is fitted on, e.g. "category tags description"
+    fields = config['text_fields']
+    features = gifts_df[fields[0]].fillna('')
+    for field in fields[1:]:
+        features = features + ' ' + gifts_df[field].fillna('')
+
+    vectorizer = TfidfVectorizer(**_vectorizer_params(config))
+    index = GiftIndex(gifts_df['price'], vectorizer.fit_transform(features))
+    index.columns = _to_columns(gifts_df, index)
+    bundle = IndexBundle(vectorizer, index, content_hash)
+
+    if save:
+        meta = {
+            'version': BUNDLE_VERSION,
+            'name': name,
+            'content_hash': content_hash,
+            'csv_size': stat.st_size,
+            'csv_mtime_ns': stat.st_mtime_ns,
+            'text_fields': config['text_fields'],
+            'vectorizer': config['vectorizer'],
+            'items': len(index),
+            'created': datetime.now().isoformat()
+        }
+        try:
+            _write_bundle(bundle_path(csv_path, name), bundle, meta)
+        except OSError as e:
+            logger.warning(f"Could not write index bundle for {csv_path}: {e}")
+
+    return bundle
+
+
+def bundle_is_current(csv_path, name):
+    """Whether the named bundle exists and matches the current catalog"""
+    try:
+        with open(os.path.join(bundle_path(csv_path, name), 'meta.json')) as f:
+            meta = json.load(f)
+        return _is_current(meta, csv_path, INDEX_CONFIGS[name])
+    except Exception:
+        return False
+
+
+def _is_current(meta, csv_path, config):
+    if (meta['version'] != BUNDLE_VERSION
+            or meta['text_fields'] != config['text_fields']
+            or meta['vectorizer'] != config['vectorizer']):
+        return False
+
+    # Only hash the CSV when its size or mtime moved since the build
+    stat = os.stat(csv_path)
+    if (stat.st_size, stat.st_mtime_ns) != (meta['csv_size'], meta['csv_mtime_ns']):
+        return catalog_hash(csv_path) == meta['content_hash']
+    return True
+
+
+def _vectorizer_params(config):
+    # JSON has no tuples; sklearn wants ngram_range as one
+    return {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in config['vectorizer'].items()
+    }
+
+
+def _to_columns(gifts_df, index):
+    """Price-ordered catalog columns in compact form
+
+    'price' reads the index's float32 prices, other numeric columns stay
+    NumPy arrays and text columns become ``EncodedColumn``s over one table
+    in which every distinct string is stored once.
+    """
+    text_columns = [column for column in gifts_df.columns
+                    if column != 'price' and gifts_df[column].dtype.kind not in 'biuf']
+    # Interning low-cardinality columns first gives them the smallest ids
+    text_columns.sort(key=lambda column: gifts_df[column].nunique())
+
+    table = {}
+    ids = {}
+    for column in text_columns:
+        values = gifts_df[column].to_numpy()[index.order]
+        column_ids = np.fromiter(
+            (table.setdefault('' if pd.isna(value) else str(value), len(table)) for value in values),
+            dtype=np.int64, count=len(values)
+        )
+        ids[column] = column_ids.astype(np.min_scalar_type(len(table)))
+    strings = StringColumn.from_values(list(table))
+
+    columns = {}
+    for column in gifts_df.columns:
+        if column == 'price':
+            columns[column] = PriceColumn(index.prices)
+        elif column in ids:
+            columns[column] = EncodedColumn(ids[column], strings)
+        else:
+            columns[column] = gifts_df[column].to_numpy()[index.order]
+    return columns
+
+
+def _write_bundle(path, bundle, meta):
+    index = bundle.index
+    terms = sorted(bundle.vectorizer.vocabulary_, key=bundle.vectorizer.vocabulary_.get)
+    vocabulary = StringColumn.from_values(terms)
+
+    arrays = {
+        'vocabulary.buffer': vocabulary.buffer,
+        'vocabulary.offsets': vocabulary.offsets,
+        'idf': bundle.vectorizer.idf_,
+        'order': index.order,
+        'prices': index.prices,
+        'postings.data': index.postings.data,
+        'postings.indices': index.postings.indices,
+        'postings.indptr': index.postings.indptr,
+        'term_max_weights': index.term_max_weights
+    }
+    meta['postings_shape'] = list(index.postings.shape)
+    meta['columns'] = {}
+    for column, values in index.columns.items():
+        if isinstance(values, PriceColumn):
+            meta['columns'][column] = 'price'
+        elif isinstance(values, EncodedColumn):
+            meta['columns'][column] = 'text'
+            arrays[f'column.{column}'] = values.ids
+            # Every text column shares the same table
+            arrays['strings.buffer'] = values.strings.buffer
+            arrays['strings.offsets'] = values.strings.offsets
+        else:
+            meta['columns'][column] = 'numeric'
+            arrays[f'column.{column}'] = values
+
+    # Write a fresh versioned directory, then repoint the symlink at it in
+    # one rename so readers never see a partial bundle
+    target = f'{path}.{meta["content_hash"][:12]}.{os.getpid()}.{time.time_ns()}'
+    os.makedirs(target)
+    for key, values in arrays.items():
+        np.save(os.path.join(target, f'{key}.npy'), np.asarray(values))
+    with open(os.path.join(target, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    temp_link = f'{path}.tmp.{os.getpid()}'
+    if os.path.lexists(temp_link):
+        os.remove(temp_link)
+    os.symlink(os.path.basename(target), temp_link)
+    os.replace(temp_link, path)
+    _remove_stale_versions(path)
+
+
+def _remove_stale_versions(path):
+    current = os.path.realpath(path)
+    directory, prefix = os.path.split(path)
+    for entry in os.listdir(directory or '.'):
+        version = os.path.join(directory, entry)
+        if (entry.startswith(f'{prefix}.') and os.path.isdir(version) and not os.path.islink(version)
+                and os.path.realpath(version) != current
+                and time.time() - os.path.getmtime(version) > STALE_BUNDLE_AGE):
+            shutil.rmtree(version, ignore_errors=True)
+
+
+def _read_bundle(path, csv_path, config):
+    """Map a bundle, or return None if it does not match the catalog/config"""
+    # Resolve the symlink once so every array comes from the same version
+    path = os.path.realpath(path)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if not _is_current(meta, csv_path, config):
+        return None
+
+    def array(key):
+        return _map_array(os.path.join(path, f'{key}.npy'))
+
+    vocabulary = StringColumn(array('vocabulary.buffer'), array('vocabulary.offsets'))
+    vectorizer = TfidfVectorizer(
+        **_vectorizer_params(config),
+        vocabulary={term: i for i, term in enumerate(vocabulary)}
+    )
+    vectorizer.idf_ = array('idf')
+
+    postings = sp.csr_matrix(
+        (array('postings.data'), array('postings.indices'), array('postings.indptr')),
+        shape=tuple(meta['postings_shape'])
+    )
+    if any(kind == 'text' for kind in meta['columns'].values()):
+        strings = StringColumn(array('strings.buffer'), array('strings.offsets'))
+    prices = array('prices')
+    columns = {}
+    for column, kind in meta['columns'].items():
+        if kind == 'price':
+            columns[column] = PriceColumn(prices)
+        elif kind == 'text':
+            columns[column] = EncodedColumn(array(f'column.{column}'), strings)
+        else:
+            columns[column] = array(f'column.{column}')
+
+    index = GiftIndex.from_arrays(
+        array('order'), prices, postings, columns, array('term_max_weights')
+    )
+    return IndexBundle(vectorizer, index, meta['content_hash'])
+
+
+def _map_array(path):
+    """Memory-map an ``.npy`` file read-only (empty arrays cannot be mapped)"""
+    try:
+        return np.load(path, mmap_mode='r')
+    except ValueError:
+        return np.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gift Guru index bundles')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build-index', help='Build index bundles next to the gift database CSV')
+    build.add_argument('csv', nargs='*', help='catalog CSV files (default: the gift database)')
+    build.add_argument('--name', action='append', choices=list(INDEX_CONFIGS),
+                       help='only build these indexes (default: all)')
+    build.add_argument('--no-lock', action='store_true',
+                       help='skip the rebuild lock (the caller already holds it)')
+    args = parser.parse_args()
+
+    for csv_path in args.csv or [find_catalog()]:
+        for name in args.name or INDEX_CONFIGS:
+            if args.no_lock:
+                bundle = build_index(csv_path, name)
+            else:
+                with rebuild_lock(csv_path, name):
+                    bundle = build_index(csv_path, name)
+            print(f"✅ {bundle_path(csv_path, name)}: {len(bundle.index)} gifts, "
+                  f"catalog {bundle.content_hash[:12]}")
+
+
+if __name__ == '__main__':
+    main()
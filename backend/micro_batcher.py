@@ -0,0 +1,93 @@
+"""Dynamic micro-batching of concurrent asyncio requests"""
+
+import asyncio
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Group items submitted close together into one call of ``process_batch``
+
+    A batch is flushed ``max_wait`` seconds after its first item arrives, or
+    as soon as it holds ``max_batch_size`` items. ``process_batch`` is an
+    async function taking a list of items and returning their results in
+    the same order; an exception it raises is raised to every caller in
+    the batch. Must be used from a single event loop.
+    """
+
+    def __init__(self, process_batch, max_batch_size=32, max_wait=0.005):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending = []  # (item, future, submitted_at)
+        self._flush_timer = None
+        self._running = set()
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes = Counter()
+        # Recent time items spent waiting for their batch to be flushed, in seconds
+        self._added_latency = deque(maxlen=1024)
+
+    async def submit(self, item):
+        """Queue ``item`` for the next batch and return its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def stats(self):
+        added_ms = np.array(self._added_latency) * 1000
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'batch_sizes': {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            'added_latency_ms': {
+                'mean': round(float(added_ms.mean()), 3) if len(added_ms) else 0.0,
+                'p95': round(float(np.percentile(added_ms, 95)), 3) if len(added_ms) else 0.0,
+                'max': round(float(added_ms.max()), 3) if len(added_ms) else 0.0
+            }
+        }
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        flushed_at = time.perf_counter()
+        self._added_latency.extend(flushed_at - submitted_at for _, _, submitted_at in batch)
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_sizes[len(batch)] += 1
+
+        # Referenced until done so the task is not garbage collected mid-flight
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        # Callers that gave up (e.g. disconnected clients) have done futures
+        try:
+            results = await self.process_batch([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,115 @@
+"""On-disk cache shared by worker processes, backed by SQLite in WAL mode
+
+Usage:
+    python persistent_cache.py vacuum DB [--compact]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """Key/value cache of JSON-serializable values with per-entry expiry
+
+    Every process (and thread) opens its own connection to the same file.
+    WAL mode lets readers run alongside a writer, and expiry timestamps are
+    wall-clock seconds indexed for cheap bulk deletion in ``vacuum``.
+    """
+
+    def __init__(self, path, ttl=3600, busy_timeout=5.0):
+        self.path = path
+        self.ttl = ttl
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)')
+
+    def get(self, key):
+        """Return ``(value, expires_at)`` for a live entry, or None"""
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?',
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._connection() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), expires_at)
+            )
+        self.writes += 1
+
+    def vacuum(self, compact=False):
+        """Delete expired entries and checkpoint the WAL; returns rows removed
+
+        With ``compact`` the database file is also rebuilt to release free
+        pages, which briefly blocks other writers.
+        """
+        db = self._connection()
+        with db:
+            removed = db.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),)).rowcount
+        db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        if compact:
+            db.execute('VACUUM')
+        logger.info(f"Vacuumed {removed} expired entries from {self.path}")
+        return removed
+
+    def stats(self):
+        entries = self._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        return {
+            'path': self.path,
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes
+        }
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gift Guru persistent cache')
+    commands = parser.add_subparsers(dest='command', required=True)
+    vacuum = commands.add_parser('vacuum', help='Delete expired entries and checkpoint the WAL')
+    vacuum.add_argument('db', help='cache database (AMAZON_CACHE_DB)')
+    vacuum.add_argument('--compact', action='store_true', help='also rebuild the file to reclaim space')
+    args = parser.parse_args()
+
+    cache = SQLiteCache(args.db)
+    removed = cache.vacuum(compact=args.compact)
+    print(f"✅ {args.db}: removed {removed} expired entries, {cache.stats()['entries']} left")
+
+
+if __name__ == '__main__':
+    main()
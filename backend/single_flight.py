@@ -0,0 +1,94 @@
+"""Coalescing of identical concurrent calls into one shared execution"""
+
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """Run at most one call per key at a time across threads
+
+    Threads that ask for a key while its call is in flight wait for that
+    call and share its result (or exception) instead of running their own.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Run at most one coroutine per key at a time on the event loop
+
+    Callers for a key already in flight await the same task. Cancelling a
+    caller does not cancel the shared task while others still wait on it;
+    it is only cancelled when every caller has gone.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._waiters = {}
+        self.coalesced = 0
+
+    async def do(self, key, coroutine_fn):
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(coroutine_fn())
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._tasks.get(key) is task and self._waiters[key] == 1:
+                # Forgotten right away, not when the task finishes cancelling,
+                # so a caller arriving meanwhile starts a fresh call instead
+                # of joining this one and getting its CancelledError
+                task.cancel()
+                self._forget(key, task)
+            raise
+        finally:
+            if self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key, task):
+        # A newer call may already be running under the same key
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -0,0 +1,119 @@
+"""Bounded in-process cache with LRU and TTL eviction"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe mapping that holds at most ``max_entries`` items for ``ttl`` seconds
+
+    The least recently used entries are evicted when the cache is full. If
+    ``max_bytes`` is set, ``sizeof(value)`` is charged per entry and LRU
+    entries are also evicted to stay under that budget. Expired entries
+    are dropped on lookup, or in bulk by ``sweep`` (see ``start_sweeper``).
+    """
+
+    def __init__(self, max_entries=1024, ttl=300, max_bytes=None, sizeof=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value, size), oldest first
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value, _ = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        """Store ``value``, expiring after ``ttl`` seconds (default: the cache TTL)"""
+        if self.max_entries <= 0:
+            return
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value, size)
+            self.bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def sweep(self):
+        """Drop every expired entry; returns how many were removed"""
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def start_sweeper(self, interval=60):
+        """Sweep expired entries every ``interval`` seconds in a daemon thread"""
+        if self._sweeper is not None:
+            return
+
+        def sweep_forever():
+            while True:
+                time.sleep(interval)
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=sweep_forever, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+        if self.max_bytes is not None:
+            stats['bytes'] = self.bytes
+            stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
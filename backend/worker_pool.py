@@ -0,0 +1,109 @@
+"""Bounded thread/process pool for running CPU-bound work off the event loop"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when the pool's queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Worker pool is saturated, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class WorkerPool:
+    """Executor with at most ``workers`` running and ``max_queue`` waiting calls
+
+    ``run`` rejects new work with ``PoolSaturated`` rather than letting the
+    backlog (and every caller's latency) grow without bound. In 'process'
+    mode the function and its arguments must be picklable, and the function
+    runs against the worker process's own copy of module state, which
+    ``initializer`` can set up.
+    """
+
+    MODES = ('thread', 'process')
+
+    def __init__(self, workers=4, max_queue=64, mode='thread', name='worker', initializer=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown pool mode {mode!r}, expected one of {self.MODES}")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.mode = mode
+        if mode == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name, initializer=initializer)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        # Recent queue waits and run times, in seconds
+        self._waits = deque(maxlen=1024)
+        self._run_times = deque(maxlen=1024)
+
+    @property
+    def queue_depth(self):
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` in the pool and return its result"""
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(self._retry_after())
+            self.in_flight += 1
+
+        submitted = time.time()
+        future = self.executor.submit(_timed_call, fn, args)
+        # Counted down when the work itself ends, even if the caller gave up
+        future.add_done_callback(lambda done: self._finish(done, submitted))
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    def stats(self):
+        with self._lock:
+            waits = np.array(self._waits) * 1000
+            run_times = np.array(self._run_times) * 1000
+            return {
+                'mode': self.mode,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'queue_depth': self.queue_depth,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'wait_ms': {
+                    'mean': round(float(waits.mean()), 3) if len(waits) else 0.0,
+                    'p95': round(float(np.percentile(waits, 95)), 3) if len(waits) else 0.0,
+                    'max': round(float(waits.max()), 3) if len(waits) else 0.0
+                },
+                'run_ms_mean': round(float(run_times.mean()), 3) if len(run_times) else 0.0
+            }
+
+    def _finish(self, future, submitted):
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            started, _ = future.result()
+            self._waits.append(max(0.0, started - submitted))
+            self._run_times.append(time.time() - started)
+            self.completed += 1
+
+    def _retry_after(self):
+        """Seconds until the current backlog should have drained"""
+        run_time = sum(self._run_times) / len(self._run_times) if self._run_times else 0.1
+        return max(1, math.ceil(self.queue_depth * run_time / self.workers))
+
+
+def _timed_call(fn, args):
+    # Module-level so process pools can pickle it; wall-clock time is
+    # comparable across processes
+    return time.time(), fn(*args)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Amazon path load test against the fake PA-API
+Drives AmazonAPIManager.search_async from concurrent clients with a Zipf
+mix of queries, fully offline, and reports request latency percentiles,
+upstream calls, throttling errors, coalesced requests and cache hit rate.
+
+Usage: python benchmarks/bench_amazon.py [--requests 500] [--concurrency 50] [--latency lognormal:0.25:0.4]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+INTERESTS = ['gaming', 'yoga', 'coffee', 'puzzle', 'skincare', 'watch', 'camping', 'novel',
+             'bluetooth speaker', 'kitchen', 'fitness', 'perfume', 'lego', 'headphones', 'tea']
+
+
+async def client(manager, queries, latencies, stale):
+    for keywords, budget in queries:
+        start = time.perf_counter()
+        search = await manager.search_async(keywords, min_price=budget[0], max_price=budget[1])
+        latencies.append(time.perf_counter() - start)
+        stale.append(search.stale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--zipf', type=float, default=1.2, help='query popularity skew')
+    parser.add_argument('--rate', type=float, default=5.0, help='manager rate limit, calls per second')
+    parser.add_argument('--latency', default='lognormal:0.25:0.4', help='fake upstream latency spec')
+    parser.add_argument('--tps', type=float, default=0.0, help='fake upstream request limit (0: none)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=5.0)
+    parser.add_argument('--cache-ttl', type=float, default=3600)
+    args = parser.parse_args()
+
+    os.environ.update({
+        'AMAZON_API_MODE': 'fake',
+        'FAKE_PAAPI_LATENCY': args.latency,
+        'FAKE_PAAPI_TPS': str(args.tps),
+        'FAKE_PAAPI_THROTTLE_RATE': str(args.throttle_rate),
+        'FAKE_PAAPI_TIMEOUT_RATE': str(args.timeout_rate),
+        'FAKE_PAAPI_TIMEOUT': str(args.timeout),
+        'AMAZON_REFRESH_SHARE': '0'
+    })
+    os.environ.pop('AMAZON_CACHE_DB', None)
+    logging.disable(logging.CRITICAL)
+    from amazon_api import AmazonAPIManager, TokenBucket
+
+    manager = AmazonAPIManager()
+    manager.rate_limiter = TokenBucket(rate=args.rate)
+    manager.cache_ttl = args.cache_ttl
+
+    rng = np.random.default_rng(42)
+    pool = [(interest, budget) for interest in INTERESTS for budget in ((0, 25), (25, 100), (100, 500))]
+    ranks = np.minimum(rng.zipf(args.zipf, args.requests), len(pool)) - 1
+    queries = [pool[rank] for rank in rng.permutation(len(pool))[ranks]]
+
+    latencies, stale = [], []
+    per_client = [queries[i::args.concurrency] for i in range(args.concurrency)]
+    start = time.perf_counter()
+
+    async def run():
+        await asyncio.gather(*(client(manager, chunk, latencies, stale) for chunk in per_client))
+
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    status = manager.get_api_status()
+    upstream = manager.api.stats()
+    print(f"{args.requests} requests, {len(set(queries))} distinct queries, "
+          f"{args.concurrency} clients in {elapsed:.1f}s")
+    print(f"latency ms   p50 {np.percentile(ms, 50):8.1f}  p95 {np.percentile(ms, 95):8.1f}  "
+          f"p99 {np.percentile(ms, 99):8.1f}  max {ms.max():8.1f}")
+    print(f"upstream     calls {upstream['calls']}  throttled {upstream['throttled']}  "
+          f"timeouts {upstream['timeouts']}")
+    print(f"manager      coalesced {status['coalesced_requests']}  "
+          f"cache hit rate {status['cache']['hit_rate']:.2%}  stale served {sum(stale)}  "
+          f"revalidations {status['revalidations']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Catalog store benchmark
+Compares the pandas DataFrame catalog (with its combined_features column,
+boolean-mask budget filter and .iloc lookups) against the compact store in
+the index bundle (float32 prices, dictionary-encoded text in one interned
+string table, __slots__ result records) on a synthetic catalog. Reports
+memory per item and the latency of a request's budget filter plus top-10
+record assembly; TF-IDF scoring is identical for both and left out.
+
+Usage: python benchmarks/bench_catalog.py [--gifts 1000000] [--requests 2000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from index_bundle import build_index
+
+CATEGORIES = ['Gaming', 'Tech', 'Beauty', 'Food', 'Books', 'Fitness', 'Music', 'Travel',
+              'Home', 'Kitchen', 'Outdoor', 'Art', 'Fashion', 'Wellness', 'Office', 'Photography']
+WORDS = ['wireless', 'premium', 'vintage', 'handmade', 'smart', 'portable', 'organic', 'classic',
+         'leather', 'bluetooth', 'yoga', 'coffee', 'puzzle', 'novel', 'camera', 'candle']
+TOP_K = 10
+
+
+def make_catalog(path, gifts, rng):
+    pd.DataFrame({
+        'product_name': [f'Gift {i}' for i in range(gifts)],
+        'price': rng.integers(500, 50000, gifts) / 100,
+        'category': rng.choice(CATEGORIES, gifts),
+        'tags': [' '.join(words) for words in rng.choice(WORDS, (gifts, 3))],
+        'description': [f'A {a} {b} gift for everyone' for a, b in rng.choice(WORDS, (gifts, 2))],
+        'link': [f'https://amazon.com/gift-{i}' for i in range(gifts)]
+    }).to_csv(path, index=False)
+
+
+def dataframe_request(gifts_df, budget_min, budget_max, rng):
+    budget_filtered = gifts_df[(gifts_df['price'] >= budget_min) & (gifts_df['price'] <= budget_max)]
+    budget_indices = budget_filtered.index
+    records = []
+    for idx in rng.integers(0, len(budget_indices), TOP_K):
+        gift = gifts_df.iloc[budget_indices[idx]]
+        records.append({
+            'name': gift['product_name'],
+            'price': float(gift['price']),
+            'description': gift['description'],
+            'link': gift['link'],
+            'category': gift['category'],
+            'similarity_score': 0.5
+        })
+    return records
+
+
+def compact_request(index, budget_min, budget_max, rng, record_type):
+    start, end = index.budget_range(budget_min, budget_max)
+    columns = index.columns
+    return [
+        record_type(
+            columns['product_name'][position],
+            columns['price'][position],
+            columns['description'][position],
+            columns['link'][position],
+            columns['category'][position],
+            0.5
+        )
+        for position in rng.integers(start, end, TOP_K).tolist()
+    ]
+
+
+def compact_bytes(index):
+    arrays = [index.prices]
+    for column in index.columns.values():
+        if hasattr(column, 'ids'):
+            arrays.append(column.ids)
+    strings = next(column.strings for column in index.columns.values() if hasattr(column, 'strings'))
+    arrays += [strings.buffer, strings.offsets]
+    return sum(array.nbytes for array in arrays)
+
+
+def time_requests(run, budgets):
+    latencies = []
+    for budget_min, budget_max in budgets:
+        start = time.perf_counter()
+        run(budget_min, budget_max)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--gifts', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    # Only the record class is needed; don't load the real catalog on import
+    os.environ['STARTUP_MODE'] = 'lazy'
+    from api import Recommendation
+
+    rng = np.random.default_rng(42)
+    lows = rng.integers(5, 400, args.requests)
+    budgets = list(zip(lows.tolist(), (lows + rng.integers(10, 100, args.requests)).tolist()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'gift_database.csv')
+        make_catalog(csv_path, args.gifts, rng)
+
+        start = time.perf_counter()
+        gifts_df = pd.read_csv(csv_path)
+        gifts_df['combined_features'] = (
+            gifts_df['category'].fillna('') + ' ' + gifts_df['tags'].fillna('') + ' ' + gifts_df['description'].fillna('')
+        )
+        df_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = build_index(csv_path, 'recommender', save=False).index
+        compact_load = time.perf_counter() - start
+
+    df_bytes = gifts_df.memory_usage(deep=True).sum()
+    df_ms = time_requests(lambda low, high: dataframe_request(gifts_df, low, high, rng), budgets)
+    compact_ms = time_requests(lambda low, high: compact_request(index, low, high, rng, Recommendation), budgets)
+
+    dict_record = dataframe_request(gifts_df, 50, 100, rng)[0]
+    slots_record = compact_request(index, 50, 100, rng, Recommendation)[0]
+
+    print(f"{args.gifts} gifts, {args.requests} requests (budget filter + top-{TOP_K} records)")
+    print(f"{'store':<12}{'MB':>10}{'bytes/item':>12}{'p50 ms':>10}{'p95 ms':>10}{'record B':>10}{'load s':>9}")
+    for name, size, ms, record, load in (
+        ('dataframe', df_bytes, df_ms, dict_record, df_load),
+        ('compact', compact_bytes(index), compact_ms, slots_record, compact_load)
+    ):
+        print(f"{name:<12}{size / 2 ** 20:>10.1f}{size / args.gifts:>12.1f}"
+              f"{np.percentile(ms, 50):>10.3f}{np.percentile(ms, 95):>10.3f}"
+              f"{sys.getsizeof(record):>10}{load:>9.1f}")
+    print("compact load includes fitting the TF-IDF index; record B excludes the field strings")
+
+
+if __name__ == '__main__':
+    main()
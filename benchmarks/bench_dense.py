@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Dense index benchmark
+Compares exact TF-IDF scoring (score_between + top_k) against the truncated
+SVD dense index in float32 and int8, reporting recall@k of the exact top-k,
+mean query latency and index memory per gift on synthetic topical catalogs.
+
+Usage: python benchmarks/bench_dense.py [--sizes 10000 100000] [--dimensions 128]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from dense_index import DenseIndex
+from gift_index import GiftIndex, top_k
+
+VOCABULARY_SIZE = 20_000
+TOPICS = 200
+TERMS_PER_TOPIC = 300
+TERMS_PER_GIFT = 30
+TERMS_PER_PROFILE = 8
+
+
+def topical_counts(rows, terms_per_row, topic_terms, rng):
+    """Rows mixing one topic's terms with general background vocabulary"""
+    topics = rng.integers(0, len(topic_terms), rows)
+    on_topic = rng.random((rows, terms_per_row)) < 0.7
+    terms = np.where(
+        on_topic,
+        topic_terms[topics[:, None], rng.integers(0, topic_terms.shape[1], (rows, terms_per_row))],
+        rng.integers(0, VOCABULARY_SIZE, (rows, terms_per_row))
+    ).ravel()
+    counts = sp.csr_matrix(
+        (np.ones(len(terms)), (np.repeat(np.arange(rows), terms_per_row), terms)),
+        shape=(rows, VOCABULARY_SIZE)
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def mean_ms(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--dimensions', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    topic_terms = rng.integers(0, VOCABULARY_SIZE, (TOPICS, TERMS_PER_TOPIC))
+
+    print(f"{'catalog':>10} {'engine':>8} | {'recall@' + str(args.k):>9} {'latency':>9} {'bytes/gift':>10}")
+    print('-' * 54)
+    for size in args.sizes:
+        counts = topical_counts(size, TERMS_PER_GIFT, topic_terms, rng)
+        document_frequency = np.bincount(counts.indices, minlength=VOCABULARY_SIZE)
+        idf = np.log((1 + size) / (1 + document_frequency)) + 1
+        index = GiftIndex(rng.integers(5, 500, size), normalize(counts @ sp.diags(idf)))
+        profiles = normalize(topical_counts(args.queries, TERMS_PER_PROFILE, topic_terms, rng) @ sp.diags(idf))
+        queries = [profiles[i] for i in range(args.queries)]
+
+        def exact(user_vector):
+            return top_k(index.score_between(user_vector, 0, size), args.k)
+
+        expected = [set(exact(query).tolist()) for query in queries]
+        sparse_bytes = (index.postings.data.nbytes + index.postings.indices.nbytes) / size
+        print(f'{size:>10} {"exact":>8} | {1:>9.3f} {mean_ms(exact, queries):>7.3f}ms {sparse_bytes:>10.0f}')
+
+        for precision in ('float32', 'int8'):
+            dense = DenseIndex(index.postings.T, args.dimensions, precision)
+
+            def dense_top_k(user_vector):
+                return top_k(dense.score_between(user_vector, 0, size), args.k)
+
+            recall = np.mean([
+                len(expected_top & set(dense_top_k(query).tolist())) / args.k
+                for expected_top, query in zip(expected, queries)
+            ])
+            print(f'{size:>10} {precision:>8} | {recall:>9.3f} {mean_ms(dense_top_k, queries):>7.3f}ms '
+                  f'{dense.bytes_per_gift:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Feedback write benchmark
+Compares per-submission latency of the append-only FeedbackWriter against the
+old read/concat/rewrite approach as user_feedback.csv grows.
+
+Usage: python benchmarks/bench_feedback.py [--writes 200] [--max-rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from feedback_store import FeedbackWriter, build_feedback_row
+
+USER_DATA = {
+    'age_range': '18-25 (Young Adult)',
+    'gender': 'Any',
+    'interests': 'gaming, tech',
+    'occasion': 'Birthday',
+    'budget_min': 30,
+    'budget_max': 70
+}
+RECOMMENDATIONS = [{'name': 'RGB Gaming Mouse'}, {'name': 'LED Strip Lights'}]
+RATINGS = [4, 5]
+
+
+def make_row():
+    return build_feedback_row(datetime.now().isoformat(), USER_DATA, RECOMMENDATIONS, RATINGS)
+
+
+def prefill(path, rows):
+    """Write ``rows`` feedback rows quickly (without timing)"""
+    writer = FeedbackWriter(path, fsync=False)
+    line = writer._format_row(make_row())
+    with open(path, 'a') as f:
+        if rows:
+            writer.append(make_row())
+            f.write(line * (rows - 1))
+    writer.close()
+
+
+def legacy_save(path, row):
+    """The previous save_feedback implementation"""
+    feedback_df = pd.DataFrame([row])
+    if os.path.exists(path):
+        existing_feedback = pd.read_csv(path)
+        feedback_df = pd.concat([existing_feedback, feedback_df], ignore_index=True)
+    feedback_df.to_csv(path, index=False)
+
+
+def time_writes(write, writes):
+    latencies = []
+    for _ in range(writes):
+        row = make_row()
+        start = time.perf_counter()
+        write(row)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--writes', type=int, default=200, help='timed writes per size')
+    parser.add_argument('--max-rows', type=int, default=1_000_000)
+    parser.add_argument('--legacy-max-rows', type=int, default=100_000,
+                        help='largest size to run the legacy rewrite at')
+    args = parser.parse_args()
+
+    sizes = [s for s in (1_000, 10_000, 100_000, 1_000_000) if s <= args.max_rows]
+
+    print(f"{'rows':>10} | {'append p50':>11} {'append p99':>11} | {'rewrite p50':>11} {'rewrite p99':>11}")
+    print('-' * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f'feedback_{size}.csv')
+            prefill(path, size)
+
+            writer = FeedbackWriter(path)
+            append_p50, append_p99 = time_writes(writer.append, args.writes)
+            writer.close()
+
+            legacy = '        -           -'
+            if size <= args.legacy_max_rows:
+                legacy_path = os.path.join(tmp, f'legacy_{size}.csv')
+                prefill(legacy_path, size)
+                # The rewrite is slow; a handful of samples is enough
+                p50, p99 = time_writes(lambda row: legacy_save(legacy_path, row), min(args.writes, 10))
+                legacy = f'{p50:9.2f}ms {p99:9.2f}ms'
+
+            print(f'{size:>10} | {append_p50:9.3f}ms {append_p99:9.3f}ms | {legacy}')
+
+            # Sanity check: analytics can still read the file
+            assert list(pd.read_csv(path, nrows=1).columns)[0] == 'timestamp'
+
+
+if __name__ == '__main__':
+    main()
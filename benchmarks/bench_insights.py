@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Recommendation insights benchmark
+Compares the old per-product loop of enhance_recommendations_with_ai_insights
+against the column-wise version, checking both produce the same output and
+reporting the cost per candidate.
+
+Usage: python benchmarks/bench_insights.py [--sizes 10 100 1000 10000] [--repeat 20]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+logging.disable(logging.CRITICAL)
+from enhanced_api import enhance_recommendations_with_ai_insights
+
+WORDS = ['gaming', 'premium', 'mature', 'wireless', 'yoga', 'coffee', 'classic', 'leather', 'kit']
+USER_PROFILE = {'interests': 'gaming tech', 'age_group': '50+', 'budget': [20, 100]}
+
+
+def legacy(products, user_profile):
+    enhanced = []
+    for product in products:
+        compatibility_factors = []
+        age_score = 0.8
+        if user_profile.get('age_group') == '13-17' and 'mature' in product.get('title', '').lower():
+            age_score = 0.3
+        elif user_profile.get('age_group') == '50+' and 'gaming' in product.get('title', '').lower():
+            age_score = 0.5
+        compatibility_factors.append(age_score)
+
+        budget = user_profile.get('budget', [20, 100])
+        price = product.get('price', 0)
+        budget_mid = (budget[0] + budget[1]) / 2
+        price_score = 1 - abs(price - budget_mid) / (budget[1] - budget[0])
+        price_score = max(0.2, min(1.0, price_score))
+        compatibility_factors.append(price_score)
+        compatibility = np.mean(compatibility_factors) * 100
+
+        insights = []
+        if product.get('rating', 0) > 4.0:
+            insights.append("⭐ Highly rated by customers")
+        if product.get('review_count', 0) > 100:
+            insights.append("📊 Popular choice with many reviews")
+        if price < budget_mid:
+            insights.append("💰 Great value for money")
+        if 'premium' in product.get('title', '').lower() or price > budget_mid * 1.5:
+            insights.append("✨ Premium quality option")
+
+        enhanced_product = product.copy()
+        enhanced_product.update({
+            'compatibility_score': round(compatibility, 1),
+            'ai_insights': insights,
+            'price_position': 'budget-friendly' if price < budget_mid else 'premium',
+            'recommendation_reason': f"Matches your interest in {user_profile.get('interests', 'gifts').split()[0]}"
+        })
+        enhanced.append(enhanced_product)
+    return enhanced
+
+
+def make_products(size, rng):
+    return [
+        {
+            'asin': f'B{i:09d}',
+            'title': ' '.join(rng.choice(WORDS, 3)).title() + ' Gift',
+            'price': round(float(rng.uniform(5, 250)), 2),
+            'rating': round(float(rng.uniform(3, 5)), 1),
+            'review_count': int(rng.integers(0, 5000)),
+            'affiliate_url': f'https://amazon.com/dp/B{i:09d}'
+        }
+        for i in range(size)
+    ]
+
+
+def per_candidate_us(fn, products, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(products, USER_PROFILE)
+    return (time.perf_counter() - start) / repeat / len(products) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'candidates':>10} | {'loop':>10} {'columnar':>10} {'speedup':>8}")
+    print('-' * 46)
+    for size in args.sizes:
+        products = make_products(size, rng)
+        assert enhance_recommendations_with_ai_insights(products, USER_PROFILE) == legacy(products, USER_PROFILE)
+        old = per_candidate_us(legacy, products, args.repeat)
+        new = per_candidate_us(enhance_recommendations_with_ai_insights, products, args.repeat)
+        print(f'{size:>10} | {old:>8.2f}us {new:>8.2f}us {old / new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+MaxScore retrieval benchmark
+Compares exact scoring of every gift in budget (score_between + top_k)
+against MaxScore pruning over the inverted index (top_k_between) on
+synthetic Zipf-distributed catalogs, and checks both return the same top-k.
+
+Usage: python benchmarks/bench_maxscore.py [--queries 200] [--k 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from gift_index import GiftIndex, top_k
+
+CATALOG_SIZES = [10_000, 100_000, 1_000_000]
+VOCABULARY_SIZE = 50_000
+TERMS_PER_GIFT = 30
+TERMS_PER_PROFILE = 8
+
+
+def term_counts(rows, terms_per_row, term_probabilities, rng):
+    terms = rng.choice(len(term_probabilities), size=rows * terms_per_row, p=term_probabilities)
+    counts = sp.csr_matrix(
+        (np.ones(len(terms)), (np.repeat(np.arange(rows), terms_per_row), terms)),
+        shape=(rows, len(term_probabilities))
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def mean_ms(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    term_probabilities = 1 / np.arange(1, VOCABULARY_SIZE + 1) ** 1.05
+    term_probabilities /= term_probabilities.sum()
+
+    print(f"{'catalog':>10} {'budget':>8} | {'exact':>9} {'maxscore':>9} | {'speedup':>7}")
+    print('-' * 52)
+    for size in CATALOG_SIZES:
+        counts = term_counts(size, TERMS_PER_GIFT, term_probabilities, rng)
+        document_frequency = np.bincount(counts.indices, minlength=VOCABULARY_SIZE)
+        idf = np.log((1 + size) / (1 + document_frequency)) + 1
+        index = GiftIndex(rng.integers(5, 500, size), normalize(counts @ sp.diags(idf)))
+        profiles = normalize(term_counts(args.queries, TERMS_PER_PROFILE, term_probabilities, rng) @ sp.diags(idf))
+
+        for label, (low, high) in [('all', (0, 500)), ('20-80', (20, 80))]:
+            start, end = index.price_range(low, high)
+            queries = [(profiles[i], start, end) for i in range(args.queries)]
+
+            def exact(user_vector, start, end):
+                scores = index.score_between(user_vector, start, end)
+                return scores[top_k(scores, args.k)]
+
+            def maxscore(user_vector, start, end):
+                return index.top_k_between(user_vector, start, end, args.k)[1]
+
+            for query in queries:
+                assert np.allclose(exact(*query), maxscore(*query)), 'top-k scores differ'
+
+            exact_ms = mean_ms(exact, queries)
+            maxscore_ms = mean_ms(maxscore, queries)
+            print(f'{size:>10} {label:>8} | {exact_ms:>7.3f}ms {maxscore_ms:>7.3f}ms | '
+                  f'{exact_ms / maxscore_ms:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
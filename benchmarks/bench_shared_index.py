@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Shared index memory benchmark
+Starts N worker processes that each load the same gift index bundle and
+score queries against it, then reports per-worker resident (RSS) and
+proportional (PSS) memory. With the memory-mapped bundle the index pages
+are shared, so total PSS stays near one worker's; --private copies the
+arrays into each worker like a per-process load would.
+
+Usage: python benchmarks/bench_shared_index.py [--gifts 200000] [--workers 8] [--private]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from index_bundle import build_index, load_index
+
+CATEGORIES = ['Gaming', 'Tech', 'Beauty', 'Food', 'Books', 'Fitness', 'Music', 'Travel']
+WORDS = ['wireless', 'premium', 'vintage', 'handmade', 'smart', 'portable', 'organic', 'classic',
+         'leather', 'bluetooth', 'yoga', 'coffee', 'puzzle', 'novel', 'camera', 'candle']
+QUERIES = ['gaming tech wireless', 'yoga fitness organic', 'coffee classic novel', 'smart camera travel']
+
+
+def make_catalog(path, gifts, rng):
+    pd.DataFrame({
+        'product_name': [f'Gift {i}' for i in range(gifts)],
+        'price': rng.integers(5, 500, gifts).astype(float),
+        'category': rng.choice(CATEGORIES, gifts),
+        'tags': [' '.join(words) for words in rng.choice(WORDS, (gifts, 4))],
+        'description': [f'A {word} gift for everyone' for word in rng.choice(WORDS, gifts)],
+        'link': [f'https://amazon.com/gift-{i}' for i in range(gifts)]
+    }).to_csv(path, index=False)
+
+
+def memory_kb():
+    """(RSS, PSS) of this process in kB"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def worker(csv_path, private, barrier, results):
+    bundle = load_index(csv_path, 'recommender')
+    index = bundle.index
+    if private:
+        index.postings = index.postings.copy()
+        index.prices = np.array(index.prices)
+        index.order = np.array(index.order)
+        strings = {}
+        for column in index.columns.values():
+            if hasattr(column, 'ids'):
+                column.ids = np.array(column.ids)
+                # Text columns share one string table; copy it once
+                table = column.strings
+                if id(table) not in strings:
+                    strings[id(table)] = table
+                    table.buffer, table.offsets = np.array(table.buffer), np.array(table.offsets)
+
+    # Touch every page a real worker would: score full-catalog queries and
+    # read every column
+    for query in QUERIES:
+        index.score_between(bundle.vectorizer.transform([query]), 0, len(index))
+    for column in index.columns.values():
+        if hasattr(column, 'ids'):
+            column.ids.sum(), column.strings.buffer.sum(), column.strings.offsets.sum()
+
+    barrier.wait()  # measure while every worker holds its index
+    results.put(memory_kb())
+    barrier.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--gifts', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--private', action='store_true', help='copy the index into every worker')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'gift_database.csv')
+        make_catalog(csv_path, args.gifts, np.random.default_rng(42))
+        start = time.perf_counter()
+        build_index(csv_path, 'recommender')
+        print(f"Built bundle for {args.gifts} gifts in {time.perf_counter() - start:.1f}s")
+
+        context = multiprocessing.get_context('fork')
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        workers = [
+            context.Process(target=worker, args=(csv_path, args.private, barrier, results))
+            for _ in range(args.workers)
+        ]
+        for process in workers:
+            process.start()
+        memory = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+
+    rss = np.array([r for r, _ in memory]) / 1024
+    pss = np.array([p for _, p in memory]) / 1024
+    mode = 'private copies' if args.private else 'memory-mapped'
+    print(f"{args.workers} workers, {mode}:")
+    print(f"  RSS per worker {rss.mean():8.1f} MB   sum {rss.sum():8.1f} MB")
+    print(f"  PSS per worker {pss.mean():8.1f} MB   sum {pss.sum():8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Top-k selection benchmark
+Compares the old full argsort + DataFrame.iloc result assembly against
+partial selection (gift_index.top_k) + pre-extracted columns.
+
+Usage: python benchmarks/bench_topk.py [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from gift_index import top_k
+
+CATALOG_SIZES = [10_000, 100_000, 1_000_000]
+K_VALUES = [5, 50, 500]
+
+
+def make_catalog(size, rng):
+    return pd.DataFrame({
+        'product_name': [f'Gift {i}' for i in range(size)],
+        'price': rng.integers(5, 500, size).astype(float),
+        'description': [f'Description for gift {i}' for i in range(size)],
+        'link': [f'https://amazon.com/gift-{i}' for i in range(size)],
+        'category': rng.choice(['Gaming', 'Tech', 'Beauty', 'Food', 'Books'], size)
+    })
+
+
+def legacy(df, scores, k):
+    top_indices = scores.argsort()[-k:][::-1]
+    results = []
+    for idx in top_indices:
+        gift = df.iloc[idx]
+        results.append({
+            'name': gift['product_name'],
+            'price': float(gift['price']),
+            'description': gift['description'],
+            'link': gift['link'],
+            'category': gift['category'],
+            'similarity_score': float(scores[idx])
+        })
+    return results
+
+
+def columnar(columns, prices, scores, k):
+    top_indices = top_k(scores, k)
+    names, descriptions = columns['name'], columns['description']
+    links, categories = columns['link'], columns['category']
+    results = []
+    for idx, score in zip(top_indices.tolist(), scores[top_indices].tolist()):
+        results.append({
+            'name': names[idx],
+            'price': float(prices[idx]),
+            'description': descriptions[idx],
+            'link': links[idx],
+            'category': categories[idx],
+            'similarity_score': score
+        })
+    return results
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'catalog':>10} {'k':>5} | {'argsort+iloc':>13} {'top_k+columns':>14} | {'speedup':>7}")
+    print('-' * 58)
+    for size in CATALOG_SIZES:
+        df = make_catalog(size, rng)
+        columns = {
+            'name': df['product_name'].tolist(),
+            'description': df['description'].tolist(),
+            'link': df['link'].tolist(),
+            'category': df['category'].tolist()
+        }
+        prices = df['price'].to_numpy()
+        # Sparse-ish similarity: most gifts share no terms with the profile
+        scores = np.where(rng.random(size) < 0.05, rng.random(size), 0.0)
+
+        for k in K_VALUES:
+            expected = [r['similarity_score'] for r in legacy(df, scores, k)]
+            actual = [r['similarity_score'] for r in columnar(columns, prices, scores, k)]
+            assert expected == actual, 'top-k scores differ'
+
+            old_ms = best_of(lambda: legacy(df, scores, k), args.repeat)
+            new_ms = best_of(lambda: columnar(columns, prices, scores, k), args.repeat)
+            print(f'{size:>10} {k:>5} | {old_ms:>11.3f}ms {new_ms:>12.3f}ms | {old_ms / new_ms:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the backend APIs
+Imports each API module in a fresh interpreter from the repository root
+(`python -c "import backend.api"`, with STARTUP_MODE=lazy) and fails when
+the best of several runs takes longer than the budget. Also lists any heavy
+libraries the import pulled in, which is the usual cause of a regression.
+
+Usage: python check_import_time.py [--budget 1.0] [--runs 3] [--module backend.api]
+Exits 1 if any module is over budget, so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Only needed once the recommender or local index is being built
+HEAVY_MODULES = ['pandas', 'sklearn', 'scipy', 'plotly', 'streamlit']
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def time_import(module):
+    """(seconds, heavy modules loaded) for importing ``module`` in a new interpreter"""
+    env = dict(os.environ, STARTUP_MODE='lazy')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe['seconds'], probe['heavy']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=float(os.getenv('IMPORT_TIME_BUDGET', '1.0')),
+                        help='seconds allowed per module import')
+    parser.add_argument('--runs', type=int, default=3, help='imports per module; the fastest counts')
+    parser.add_argument('--module', action='append', help='module to check (default: backend.api, backend.enhanced_api)')
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.module or ['backend.api', 'backend.enhanced_api']:
+        try:
+            runs = [time_import(module) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            over_budget = True
+            error = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else f"exit status {e.returncode}"
+            print(f"❌ import {module} failed: {error}")
+            continue
+        seconds, heavy = min(runs)
+        passed = seconds <= args.budget
+        over_budget |= not passed
+        print(f"{'✅' if passed else '❌'} import {module}: {seconds:.3f}s (budget {args.budget:.3f}s)")
+        if heavy:
+            print(f"   📝 loaded at import: {', '.join(heavy)}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,7 +21,7 @@ def demo_gift_recommendations():
     # Initialize recommender
     print("\n🤖 Initializing AI Gift Recommender...")
     recommender = GiftRecommender()
-    print(f"✅ Loaded {len(recommender.gifts_df)} gifts from database")
+    print(f"✅ Loaded {len(recommender.gift_index)} gifts from database")
     
     # Demo scenarios
     demo_scenarios = [
@@ -92,9 +92,10 @@ def demo_gift_recommendations():
     
     # Show database statistics
     print(f"\n📊 Gift Database Statistics:")
-    print(f"   • Total Gifts: {len(recommender.gifts_df)}")
-    print(f"   • Price Range: ${recommender.gifts_df['price'].min():.0f} - ${recommender.gifts_df['price'].max():.0f}")
-    print(f"   • Categories: {', '.join(recommender.gifts_df['category'].unique()[:8])}...")
+    gift_index = recommender.gift_index
+    print(f"   • Total Gifts: {len(gift_index)}")
+    print(f"   • Price Range: ${gift_index.prices.min():.0f} - ${gift_index.prices.max():.0f}")
+    print(f"   • Categories: {', '.join(gift_index.columns['category'].distinct()[:8])}...")
     
     # Show sample Malayali humor
     print(f"\n😄 Sample Malayali Humor Phrases:")
@@ -6,7 +6,7 @@ print('='*50)
 
 # Initialize the recommender
 recommender = GiftRecommender()
-print(f'✅ AI Engine Loaded: {len(recommender.gifts_df)} gifts ready')
+print(f'✅ AI Engine Loaded: {len(recommender.gift_index)} gifts ready')
 
 # Sample user input (what you'd enter in the web form)
 print('\n📝 Sample User Input:')
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for the backend's concurrency primitives
+Covers call coalescing (SingleFlight, AsyncSingleFlight), TokenBucket
+reservations and refunds, and the index bundle rebuild lock. Runs under
+pytest or directly:
+python test_concurrency.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from amazon_api import TokenBucket
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_single_flight_shares_result():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do('key', fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while flights.coalesced < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['result'] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_exception():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ValueError('upstream failed')
+
+    errors = []
+
+    def caller():
+        try:
+            flights.do('key', fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while flights.coalesced < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 4 and len({id(e) for e in errors}) == 1
+    # The key is free again once the call is over
+    assert flights.do('key', lambda: 'again') == 'again'
+
+
+def test_async_single_flight_shares_result_and_exception():
+    async def run():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError('upstream failed')
+
+        results = await asyncio.gather(*(flights.do('key', fetch) for _ in range(5)))
+        errors = await asyncio.gather(*(flights.do('bad', fail) for _ in range(3)), return_exceptions=True)
+        return flights, calls, results, errors
+
+    flights, calls, results, errors = asyncio.run(run())
+    assert results == ['result'] * 5 and len(calls) == 1
+    assert all(isinstance(e, ValueError) for e in errors) and len({id(e) for e in errors}) == 1
+    assert flights.coalesced == 6
+    assert not flights._tasks and not flights._waiters
+
+
+def test_async_single_flight_survives_one_waiter_cancelling():
+    async def run():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        first = asyncio.ensure_future(flights.do('key', fetch))
+        second = asyncio.ensure_future(flights.do('key', fetch))
+        await asyncio.sleep(0)
+        assert flights._waiters['key'] == 2
+        first.cancel()
+        await asyncio.sleep(0)
+        assert flights._waiters['key'] == 1
+        return calls, await second, first.cancelled()
+
+    calls, result, first_cancelled = asyncio.run(run())
+    assert result == 'result' and first_cancelled and len(calls) == 1
+
+
+def test_async_single_flight_cancels_when_every_waiter_is_gone():
+    async def run():
+        flights = AsyncSingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(flights.do('key', fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return flights
+
+    flights = asyncio.run(run())
+    assert not flights._tasks and not flights._waiters
+
+
+def test_async_single_flight_new_caller_does_not_join_cancelled_call():
+    # Regression: a caller arriving while the abandoned call was still
+    # cancelling joined it and got its CancelledError
+    async def run():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            try:
+                await asyncio.sleep(0.02)
+            except asyncio.CancelledError:
+                # Cleanup that takes a few loop ticks
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                raise
+            return 'result'
+
+        leader = asyncio.ensure_future(flights.do('key', fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        result = await flights.do('key', fetch)
+        await asyncio.sleep(0.01)
+        return flights, calls, result
+
+    flights, calls, result = asyncio.run(run())
+    assert result == 'result'
+    assert len(calls) == 2
+    assert not flights._tasks and not flights._waiters
+
+
+def test_token_bucket_queues_in_arrival_order():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+    assert bucket.queued == 2
+    clock.now = 1.0
+    assert bucket.queued == 0
+
+
+def test_token_bucket_refunds_only_the_last_reservation():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    bucket.reserve()
+    _, first = bucket._reserve()
+    _, second = bucket._reserve()
+
+    # Refunding from the middle of the queue would give its slot away twice
+    bucket._cancel(first)
+    assert bucket.queued == 2
+    bucket._cancel(second)
+    assert bucket.queued == 1
+    assert bucket.reserve() == 2.0
+
+
+def test_token_bucket_refunds_cancelled_async_wait():
+    async def run():
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire_async()
+        waiter = asyncio.ensure_future(bucket.acquire_async())
+        await asyncio.sleep(0)
+        assert bucket.queued == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return bucket.queued
+
+    assert asyncio.run(run()) == 0
+
+
+def test_rebuild_lock_rebuilds_once():
+    import index_bundle
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'gift_database.csv')
+        with open(csv_path, 'w') as f:
+            f.write('product_name,price,category,tags,description,link\n'
+                    'Yoga Mat,38,Health,yoga fitness,A mat,https://example.com/mat\n'
+                    'Mouse,45,Gaming,gaming rgb,A mouse,https://example.com/mouse\n')
+
+        built = []
+        real_build = index_bundle.build_index
+
+        def counting_build(*args, **kwargs):
+            built.append(1)
+            time.sleep(0.05)  # keep the lock held while the others arrive
+            return real_build(*args, **kwargs)
+
+        index_bundle.build_index = counting_build
+        try:
+            threads = [
+                threading.Thread(target=index_bundle.load_index, args=(csv_path, 'recommender'))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            index_bundle.build_index = real_build
+
+        assert len(built) == 1
+        assert index_bundle.bundle_is_current(csv_path, 'recommender')
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except (Exception, asyncio.CancelledError) as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {type(e).__name__} {e}")
+    print(f"\n📊 {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)